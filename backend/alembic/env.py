@@ -8,7 +8,7 @@ from alembic import context
 # Import your models and config
 from app.core.config import settings
 from app.core.database import Base
-from app.models import User, Room, JoinRequest, HostSubscription, RoomMember, Review  # Import all models
+from app.models import User, Room, JoinRequest, HostSubscription, RoomMember, Review, GeocodeCache, LocationAccessAudit  # Import all models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -41,10 +41,16 @@ POSTGIS_SYSTEM_TABLES = {
 }
 
 
+# Monthly partitions of location_access_audit, created at runtime by the audit sink
+AUDIT_PARTITION_PREFIX = 'location_access_audit_'
+
+
 def include_object(object, name, type_, reflected, compare_to):
-    """Exclude PostGIS system tables from autogenerate"""
+    """Exclude PostGIS system tables and audit partitions from autogenerate"""
     if type_ == "table" and name in POSTGIS_SYSTEM_TABLES:
         return False
+    if type_ == "table" and reflected and name.startswith(AUDIT_PARTITION_PREFIX):
+        return False
     return True
 
 # other values from the config, defined by the needs of env.py,
@@ -0,0 +1,41 @@
+"""Add location_access_audit table (partitioned by month)
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('location_access_audit',
+    sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column('accessed_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('access_granted', sa.Boolean(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'accessed_at'),
+    postgresql_partition_by='RANGE (accessed_at)'
+    )
+    # Indexes on the parent are created on every partition
+    op.create_index('ix_location_access_audit_room_time', 'location_access_audit', ['room_id', 'accessed_at'], unique=False)
+    op.create_index('ix_location_access_audit_user_time', 'location_access_audit', ['user_id', 'accessed_at'], unique=False)
+    # Monthly partitions are created on demand by app.utils.location_audit
+
+
+def downgrade() -> None:
+    # Dropping the parent drops its partitions
+    op.drop_index('ix_location_access_audit_user_time', table_name='location_access_audit')
+    op.drop_index('ix_location_access_audit_room_time', table_name='location_access_audit')
+    op.drop_table('location_access_audit')
@@ -0,0 +1,62 @@
+"""Replace room_members.queue_position with a monotonic queue_key
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS room_members_queue_key_seq")
+    op.add_column('room_members', sa.Column('queue_key', sa.BigInteger(), nullable=True))
+    
+    # Keep the current waitlist order
+    op.execute("""
+        UPDATE room_members m
+        SET queue_key = ordered.key
+        FROM (
+            SELECT id, nextval('room_members_queue_key_seq') AS key
+            FROM (
+                SELECT id FROM room_members
+                WHERE status = 'waitlisted'
+                ORDER BY room_id, queue_position NULLS LAST, joined_at, id
+            ) AS waitlist
+        ) AS ordered
+        WHERE m.id = ordered.id
+    """)
+    
+    op.create_index(
+        'ix_room_members_waitlist_order', 'room_members', ['room_id', 'queue_key'],
+        unique=False, postgresql_where=sa.text("status = 'waitlisted'")
+    )
+    op.drop_index('ix_room_members_queue_position', table_name='room_members')
+    op.drop_column('room_members', 'queue_position')
+
+
+def downgrade() -> None:
+    op.add_column('room_members', sa.Column('queue_position', sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE room_members m
+        SET queue_position = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY room_id ORDER BY queue_key) AS position
+            FROM room_members
+            WHERE status = 'waitlisted'
+        ) AS ranked
+        WHERE m.id = ranked.id
+    """)
+    op.create_index('ix_room_members_queue_position', 'room_members', ['queue_position'], unique=False)
+    op.drop_index('ix_room_members_waitlist_order', table_name='room_members')
+    op.drop_column('room_members', 'queue_key')
+    op.execute("DROP SEQUENCE IF EXISTS room_members_queue_key_seq")
@@ -0,0 +1,28 @@
+"""Add rooms.auto_promote_waitlist
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'rooms',
+        sa.Column('auto_promote_waitlist', sa.Boolean(), server_default='false', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('rooms', 'auto_promote_waitlist')
@@ -0,0 +1,52 @@
+"""Add denormalized seat counters to rooms
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rooms', sa.Column('active_member_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('rooms', sa.Column('waitlist_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('rooms', sa.Column(
+        'has_open_seats',
+        sa.Boolean(),
+        sa.Computed('max_players IS NULL OR active_member_count < max_players', persisted=True),
+        nullable=True,
+    ))
+
+    # Backfill counters from existing memberships
+    op.execute("""
+        UPDATE rooms
+        SET active_member_count = counts.active,
+            waitlist_count = counts.waitlisted
+        FROM (
+            SELECT room_id,
+                   count(*) FILTER (WHERE status = 'active') AS active,
+                   count(*) FILTER (WHERE status = 'waitlisted') AS waitlisted
+            FROM room_members
+            GROUP BY room_id
+        ) AS counts
+        WHERE rooms.id = counts.room_id
+    """)
+
+    op.create_index(op.f('ix_rooms_has_open_seats'), 'rooms', ['has_open_seats'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_rooms_has_open_seats'), table_name='rooms')
+    op.drop_column('rooms', 'has_open_seats')
+    op.drop_column('rooms', 'waitlist_count')
+    op.drop_column('rooms', 'active_member_count')
@@ -0,0 +1,30 @@
+"""Add keyset ordering index for room discovery
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches ORDER BY COALESCE(scheduled_at, created_at) DESC, id DESC in list_rooms
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_rooms_discovery_order
+        ON rooms ((COALESCE(scheduled_at, created_at)) DESC, id DESC)
+        WHERE is_active = true
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_rooms_discovery_order")
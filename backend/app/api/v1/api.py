@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, rooms, join_requests, reputation
+from app.api.v1.endpoints import auth, users, rooms, join_requests, reputation, events
 
 api_router = APIRouter()
 
@@ -9,4 +9,5 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(rooms.router, prefix="/rooms", tags=["rooms"])
 api_router.include_router(join_requests.router, prefix="/join-requests", tags=["join-requests"])
 api_router.include_router(reputation.router, tags=["reputation"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
 
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.models.user import User as UserModel
@@ -8,7 +9,7 @@ from app.schemas.user import (
     UserCreate, User, EmailLogin, GoogleSignIn, AppleSignIn, TokenResponse
 )
 from app.utils.security import (
-    verify_password, get_password_hash, create_access_token,
+    verify_and_update_password, get_password_hash_async, create_access_token,
     verify_google_token, verify_apple_token
 )
 from app.core.config import settings
@@ -17,12 +18,12 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user with email and password"""
     # Check if email or username already exists
-    existing_user = db.query(UserModel).filter(
+    existing_user = await db.scalar(select(UserModel).where(
         or_(UserModel.email == user_data.email, UserModel.username == user_data.username)
-    ).first()
+    ))
     
     if existing_user:
         raise HTTPException(
@@ -38,7 +39,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = UserModel(
         email=user_data.email,
         username=user_data.username,
@@ -51,8 +52,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Create access token
     access_token = create_access_token(data={"sub": str(db_user.id)})
@@ -64,10 +65,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(credentials: EmailLogin, db: Session = Depends(get_db)):
+async def login(credentials: EmailLogin, db: AsyncSession = Depends(get_db)):
     """Login with email and password"""
     # Find user by email
-    user = db.query(UserModel).filter(UserModel.email == credentials.email).first()
+    user = await db.scalar(select(UserModel).where(UserModel.email == credentials.email))
     
     if not user:
         raise HTTPException(
@@ -83,7 +84,8 @@ async def login(credentials: EmailLogin, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(credentials.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -96,6 +98,12 @@ async def login(credentials: EmailLogin, db: Session = Depends(get_db)):
             detail="Account is inactive"
         )
     
+    # Stored hash used a different bcrypt cost - upgrade it while we have the
+    # password (only for logins that succeed)
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create access token
     access_token = create_access_token(data={"sub": str(user.id)})
     
@@ -106,7 +114,7 @@ async def login(credentials: EmailLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/google", response_model=TokenResponse)
-async def google_signin(google_data: GoogleSignIn, db: Session = Depends(get_db)):
+async def google_signin(google_data: GoogleSignIn, db: AsyncSession = Depends(get_db)):
     """Sign in or register with Google"""
     if not settings.GOOGLE_CLIENT_ID:
         raise HTTPException(
@@ -114,9 +122,9 @@ async def google_signin(google_data: GoogleSignIn, db: Session = Depends(get_db)
             detail="Google OAuth is not configured"
         )
     
-    # Verify Google token
+    # Verify Google token (off the event loop: a cold key cache fetches over HTTP)
     try:
-        google_user_info = verify_google_token(google_data.id_token)
+        google_user_info = await run_in_threadpool(verify_google_token, google_data.id_token)
     except HTTPException:
         raise
     except Exception as e:
@@ -136,12 +144,12 @@ async def google_signin(google_data: GoogleSignIn, db: Session = Depends(get_db)
         )
     
     # Check if user exists by email or provider_id
-    user = db.query(UserModel).filter(
+    user = await db.scalar(select(UserModel).where(
         or_(
             UserModel.email == email,
             UserModel.provider_id == provider_id
         )
-    ).first()
+    ))
     
     if user:
         # Update provider info if needed
@@ -150,15 +158,15 @@ async def google_signin(google_data: GoogleSignIn, db: Session = Depends(get_db)
             user.provider_id = provider_id
             if full_name and not user.full_name:
                 user.full_name = full_name
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
     else:
         # Create new user
         # Generate username from email if not provided
         username_base = email.split('@')[0]
         username = username_base
         counter = 1
-        while db.query(UserModel).filter(UserModel.username == username).first():
+        while await db.scalar(select(UserModel).where(UserModel.username == username)):
             username = f"{username_base}{counter}"
             counter += 1
         
@@ -173,8 +181,8 @@ async def google_signin(google_data: GoogleSignIn, db: Session = Depends(get_db)
             is_verified=google_user_info.get('email_verified', False)
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     
     # Check if user is active
     if not user.is_active:
@@ -193,7 +201,7 @@ async def google_signin(google_data: GoogleSignIn, db: Session = Depends(get_db)
 
 
 @router.post("/apple", response_model=TokenResponse)
-async def apple_signin(apple_data: AppleSignIn, db: Session = Depends(get_db)):
+async def apple_signin(apple_data: AppleSignIn, db: AsyncSession = Depends(get_db)):
     """Sign in or register with Apple"""
     if not settings.APPLE_CLIENT_ID:
         raise HTTPException(
@@ -201,9 +209,9 @@ async def apple_signin(apple_data: AppleSignIn, db: Session = Depends(get_db)):
             detail="Apple OAuth is not configured"
         )
     
-    # Verify Apple token
+    # Verify Apple token (off the event loop: a cold key cache fetches over HTTP)
     try:
-        apple_user_info = verify_apple_token(apple_data.id_token)
+        apple_user_info = await run_in_threadpool(verify_apple_token, apple_data.id_token)
     except HTTPException:
         raise
     except Exception as e:
@@ -222,20 +230,20 @@ async def apple_signin(apple_data: AppleSignIn, db: Session = Depends(get_db)):
         )
     
     # Check if user exists by provider_id (Apple uses stable sub)
-    user = db.query(UserModel).filter(UserModel.provider_id == provider_id).first()
+    user = await db.scalar(select(UserModel).where(UserModel.provider_id == provider_id))
     
     if user:
         # Update email if provided and different
         if email and user.email != email:
             # Check if email is already used by another account
-            existing_email_user = db.query(UserModel).filter(
+            existing_email_user = await db.scalar(select(UserModel).where(
                 UserModel.email == email,
                 UserModel.id != user.id
-            ).first()
+            ))
             if not existing_email_user:
                 user.email = email
-                db.commit()
-                db.refresh(user)
+                await db.commit()
+                await db.refresh(user)
     else:
         # For new users, email might not be in token (Apple only sends it on first sign-in)
         # Use email from token if available, otherwise we'll need to handle it
@@ -253,7 +261,7 @@ async def apple_signin(apple_data: AppleSignIn, db: Session = Depends(get_db)):
         username_base = email.split('@')[0] if email else f"apple_user_{provider_id[:8]}"
         username = username_base
         counter = 1
-        while db.query(UserModel).filter(UserModel.username == username).first():
+        while await db.scalar(select(UserModel).where(UserModel.username == username)):
             username = f"{username_base}{counter}"
             counter += 1
         
@@ -267,8 +275,8 @@ async def apple_signin(apple_data: AppleSignIn, db: Session = Depends(get_db)):
             is_verified=apple_user_info.get('email_verified', False)
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     
     # Check if user is active
     if not user.is_active:
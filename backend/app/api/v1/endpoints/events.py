@@ -0,0 +1,71 @@
+"""
+Server-Sent Events stream of the current user's join request, waitlist and
+room status changes (see app/utils/events.py).
+
+Clients fetch their state once when the stream opens (and again on a
+`resync` event), then apply events instead of polling.
+"""
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.utils.auth import Principal, get_current_user
+from app.utils.events import event_broker
+
+router = APIRouter()
+
+# Client reconnect delay after a dropped stream (milliseconds)
+RETRY_MS = 5000
+
+
+def _format_event(event: dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream events for the current user as text/event-stream.
+
+    Event types:
+    - join_request: {id, room_id, status} when one of your requests is decided
+    - membership: {room_id, status} when you are seated, waitlisted, removed or kicked
+    - waitlist_position: {room_id, queue_position, total_in_queue} when the line moves
+    - room_status: {room_id, status, is_active, max_players, active_member_count, has_open_seats}
+      for rooms you're in or have asked to join
+    - resync: events were missed; refetch state
+
+    Idle streams get a comment line every EVENTS_HEARTBEAT_SECONDS.
+    """
+    # Authentication may have used a connection; don't hold it for the life of the stream
+    await db.close()
+
+    async def event_source():
+        async with event_broker.subscribe(current_user.id) as queue:
+            yield f"retry: {RETRY_MS}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_event(event)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+        }
+    )
@@ -1,60 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import and_, case, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
-from app.schemas.join_request import JoinRequest, JoinRequestCreate, JoinRequestUpdate
+from app.schemas.join_request import (
+    JoinRequest,
+    JoinRequestCreate,
+    JoinRequestUpdate,
+    JoinRequestInboxItem,
+    JoinRequestBulkDecide,
+    JoinRequestBulkDecideResult,
+)
 from app.models.join_request import JoinRequest as JoinRequestModel, JoinRequestStatus
 from app.models.room import Room as RoomModel
-from app.models.room_member import RoomMember as RoomMemberModel, RoomMemberStatus
-from app.models.user import User
-from app.utils.auth import get_current_user
+from app.models.room_member import RoomMember as RoomMemberModel, RoomMemberStatus, queue_key_seq
+from app.models.user import User as UserModel
+from app.utils.auth import Principal, get_current_user
+from app.utils.discovery_cache import invalidate_discovery_cache
+from app.utils.events import notify_join_requests, notify_memberships, notify_waitlist_positions
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.utils.room_counters import adjust_room_counters, record_member_transition
+from app.utils.waitlist import lock_room
 
 router = APIRouter()
 
+DEFAULT_INBOX_LIMIT = 50
+MAX_INBOX_LIMIT = 100
 
-def get_active_member_count(db: Session, room_id: int) -> int:
-    """Get count of active members in a room (excluding waitlisted)"""
-    return db.query(RoomMemberModel).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.status == RoomMemberStatus.ACTIVE
-    ).count()
 
-
-def get_next_queue_position(db: Session, room_id: int) -> int:
-    """Get the next available queue position for a room's waitlist"""
-    max_position = db.query(func.max(RoomMemberModel.queue_position)).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.status == RoomMemberStatus.WAITLISTED
-    ).scalar()
-    return (max_position or 0) + 1
+async def get_active_member_count(db: AsyncSession, room_id: int) -> int:
+    """Get count of active members in a room (excluding waitlisted)"""
+    return await db.scalar(
+        select(func.count(RoomMemberModel.id)).where(
+            RoomMemberModel.room_id == room_id,
+            RoomMemberModel.status == RoomMemberStatus.ACTIVE
+        )
+    )
 
 
-def reorder_queue_after_removal(db: Session, room_id: int, removed_position: int):
-    """Decrement queue positions for all waitlisted members after a removed position"""
-    db.query(RoomMemberModel).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.status == RoomMemberStatus.WAITLISTED,
-        RoomMemberModel.queue_position > removed_position
-    ).update({
-        RoomMemberModel.queue_position: RoomMemberModel.queue_position - 1
-    })
+async def get_waitlist_position(db: AsyncSession, room_id: int, queue_key: int) -> int:
+    """1-based waitlist position of the member holding queue_key (index range count)"""
+    return await db.scalar(
+        select(func.count()).where(
+            RoomMemberModel.room_id == room_id,
+            RoomMemberModel.status == RoomMemberStatus.WAITLISTED,
+            RoomMemberModel.queue_key <= queue_key
+        )
+    )
 
 
 @router.post("/", response_model=JoinRequest, status_code=status.HTTP_201_CREATED)
 async def create_join_request(
     request_data: JoinRequestCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a join request for a room"""
     # Check if room exists and is active
-    room = db.query(RoomModel).filter(
+    room = await db.scalar(select(RoomModel).where(
         RoomModel.id == request_data.room_id,
         RoomModel.is_active == True
-    ).first()
+    ))
     
     if not room:
         raise HTTPException(
@@ -70,11 +79,11 @@ async def create_join_request(
         )
     
     # Check if user already has a pending request
-    existing_request = db.query(JoinRequestModel).filter(
+    existing_request = await db.scalar(select(JoinRequestModel).where(
         JoinRequestModel.user_id == current_user.id,
         JoinRequestModel.room_id == request_data.room_id,
         JoinRequestModel.status == JoinRequestStatus.PENDING
-    ).first()
+    ))
     
     if existing_request:
         raise HTTPException(
@@ -83,11 +92,11 @@ async def create_join_request(
         )
     
     # Check if user is already an active member
-    existing_member = db.query(RoomMemberModel).filter(
+    existing_member = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.user_id == current_user.id,
         RoomMemberModel.room_id == request_data.room_id,
         RoomMemberModel.status == RoomMemberStatus.ACTIVE
-    ).first()
+    ))
     
     if existing_member:
         raise HTTPException(
@@ -104,8 +113,8 @@ async def create_join_request(
     )
     
     db.add(join_request)
-    db.commit()
-    db.refresh(join_request)
+    await db.commit()
+    await db.refresh(join_request)
     
     return join_request
 
@@ -115,34 +124,32 @@ async def list_join_requests(
     room_id: int = None,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List join requests.
     - If room_id provided and user is host: returns all requests for that room
     - Otherwise: returns user's own requests
     """
-    # Debug logging
-    print(f"DEBUG: list_join_requests called - room_id={room_id}, current_user.id={current_user.id}")
-    
     if room_id:
         # Check if user is the host of this room
-        room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
-        print(f"DEBUG: room found={room is not None}, room.host_id={room.host_id if room else None}")
+        room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
         if room and room.host_id == current_user.id:
             # Return all requests for this room
-            requests = db.query(JoinRequestModel).filter(
-                JoinRequestModel.room_id == room_id
-            ).offset(skip).limit(limit).all()
-            print(f"DEBUG: Returning {len(requests)} requests for room {room_id}")
+            requests = (await db.scalars(
+                select(JoinRequestModel).where(
+                    JoinRequestModel.room_id == room_id
+                ).offset(skip).limit(limit)
+            )).all()
             return requests
     
     # Return user's own requests
-    requests = db.query(JoinRequestModel).filter(
-        JoinRequestModel.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    print(f"DEBUG: Returning {len(requests)} user's own requests")
+    requests = (await db.scalars(
+        select(JoinRequestModel).where(
+            JoinRequestModel.user_id == current_user.id
+        ).offset(skip).limit(limit)
+    )).all()
     
     return requests
 
@@ -150,13 +157,13 @@ async def list_join_requests(
 @router.get("/{request_id}", response_model=JoinRequest)
 async def get_join_request(
     request_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get join request by ID"""
-    join_request = db.query(JoinRequestModel).filter(
+    join_request = await db.scalar(select(JoinRequestModel).where(
         JoinRequestModel.id == request_id
-    ).first()
+    ))
     
     if not join_request:
         raise HTTPException(
@@ -165,7 +172,7 @@ async def get_join_request(
         )
     
     # Check permission: must be the requester or the room host
-    room = db.query(RoomModel).filter(RoomModel.id == join_request.room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == join_request.room_id))
     if join_request.user_id != current_user.id and room.host_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -179,8 +186,8 @@ async def get_join_request(
 async def update_join_request(
     request_id: int,
     request_update: JoinRequestUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update join request status (approve/reject - host only).
@@ -192,9 +199,9 @@ async def update_join_request(
     Note: Host cannot approve a waitlisted user unless they are first in queue
     AND there is space available. Use the dedicated waitlist endpoints for that.
     """
-    join_request = db.query(JoinRequestModel).filter(
+    join_request = await db.scalar(select(JoinRequestModel).where(
         JoinRequestModel.id == request_id
-    ).first()
+    ))
     
     if not join_request:
         raise HTTPException(
@@ -202,8 +209,8 @@ async def update_join_request(
             detail="Join request not found"
         )
     
-    # Get the room
-    room = db.query(RoomModel).filter(RoomModel.id == join_request.room_id).first()
+    # Get the room, locked so concurrent approvals can't overfill it
+    room = await lock_room(db, join_request.room_id)
     
     # Only the host can approve/reject requests
     if room.host_id != current_user.id:
@@ -212,6 +219,9 @@ async def update_join_request(
             detail="Only the room host can approve or reject requests"
         )
     
+    # Re-read under the lock: a concurrent call may have just decided it
+    await db.refresh(join_request)
+    
     # Can only update pending requests
     if join_request.status != JoinRequestStatus.PENDING:
         raise HTTPException(
@@ -226,27 +236,29 @@ async def update_join_request(
         # If APPROVED, create a RoomMember record
         if request_update.status == JoinRequestStatus.APPROVED:
             # Check if member record already exists
-            existing_member = db.query(RoomMemberModel).filter(
+            existing_member = await db.scalar(select(RoomMemberModel).where(
                 RoomMemberModel.user_id == join_request.user_id,
                 RoomMemberModel.room_id == join_request.room_id
-            ).first()
+            ))
             
             # Check room capacity
-            active_count = get_active_member_count(db, join_request.room_id)
+            active_count = await get_active_member_count(db, join_request.room_id)
             room_has_space = room.max_players is None or active_count < room.max_players
             
             if existing_member:
+                previous_status = existing_member.status
                 if room_has_space:
                     # Reactivate as ACTIVE member
                     existing_member.status = RoomMemberStatus.ACTIVE
-                    existing_member.queue_position = None
+                    existing_member.queue_key = None
                     existing_member.joined_at = datetime.utcnow()
                     existing_member.left_at = None
                 else:
                     # Add to waitlist
                     existing_member.status = RoomMemberStatus.WAITLISTED
-                    existing_member.queue_position = get_next_queue_position(db, join_request.room_id)
+                    existing_member.queue_key = queue_key_seq.next_value()
                     existing_member.left_at = None
+                await record_member_transition(db, join_request.room_id, previous_status, existing_member.status)
             else:
                 if room_has_space:
                     # Create new ACTIVE member record
@@ -255,7 +267,7 @@ async def update_join_request(
                         room_id=join_request.room_id,
                         is_host=False,
                         status=RoomMemberStatus.ACTIVE,
-                        queue_position=None,
+                        queue_key=None,
                         joined_at=datetime.utcnow()
                     )
                 else:
@@ -265,30 +277,194 @@ async def update_join_request(
                         room_id=join_request.room_id,
                         is_host=False,
                         status=RoomMemberStatus.WAITLISTED,
-                        queue_position=get_next_queue_position(db, join_request.room_id),
+                        queue_key=queue_key_seq.next_value(),
                         joined_at=datetime.utcnow()
                     )
                 db.add(new_member)
+                await record_member_transition(db, join_request.room_id, None, new_member.status)
     
     if request_update.message is not None:
         join_request.message = request_update.message
     
-    db.commit()
-    db.refresh(join_request)
+    if request_update.status:
+        await db.flush()
+        await notify_join_requests(db, [join_request.id])
+        if request_update.status == JoinRequestStatus.APPROVED:
+            await notify_memberships(db, join_request.room_id, [join_request.user_id])
+    
+    await db.commit()
+    invalidate_discovery_cache()
+    await db.refresh(join_request)
     
     return join_request
 
 
+@router.post("/bulk-decide", response_model=JoinRequestBulkDecideResult)
+async def bulk_decide_join_requests(
+    decision: JoinRequestBulkDecide,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Approve and reject many pending requests for one room in one transaction (host only).
+    
+    Approved requesters are seated in request order (oldest first) while the
+    room has open seats; the rest join the end of the waitlist in the same
+    order. Requests that aren't pending or belong to another room are
+    skipped rather than failing the whole batch.
+    
+    The room row is locked for the duration, and the work is a fixed number
+    of set-based statements however many requests are decided.
+    """
+    approve_ids = set(decision.approve)
+    reject_ids = set(decision.reject)
+    if approve_ids & reject_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A request cannot be both approved and rejected"
+        )
+    
+    room = await lock_room(db, decision.room_id)
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+    
+    if room.host_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the room host can approve or reject requests"
+        )
+    
+    # Pending requests named in the call, oldest first
+    pending = (await db.execute(
+        select(JoinRequestModel.id, JoinRequestModel.user_id).where(
+            JoinRequestModel.id.in_(approve_ids | reject_ids),
+            JoinRequestModel.room_id == room.id,
+            JoinRequestModel.status == JoinRequestStatus.PENDING
+        ).order_by(
+            JoinRequestModel.created_at,
+            JoinRequestModel.id
+        ).with_for_update()
+    )).all()
+    
+    approved = [row for row in pending if row.id in approve_ids]
+    rejected = [row.id for row in pending if row.id in reject_ids]
+    decided_ids = {row.id for row in pending}
+    skipped = sorted((approve_ids | reject_ids) - decided_ids)
+    
+    activated, waitlisted = [], []
+    if approved:
+        # Existing membership rows (people who left or were removed before)
+        existing = {
+            row.user_id: row
+            for row in (await db.execute(
+                select(RoomMemberModel.user_id, RoomMemberModel.status, RoomMemberModel.queue_key).where(
+                    RoomMemberModel.room_id == room.id,
+                    RoomMemberModel.user_id.in_([row.user_id for row in approved])
+                )
+            )).all()
+        }
+        
+        active_count = await get_active_member_count(db, room.id)
+        open_seats = None if room.max_players is None else max(room.max_players - active_count, 0)
+        
+        now = datetime.utcnow()
+        members = []
+        active_delta = waitlist_delta = 0
+        for request in approved:
+            old = existing.get(request.user_id)
+            old_status = old.status if old else None
+            
+            if old_status == RoomMemberStatus.ACTIVE:
+                # Already seated; nothing to change
+                activated.append(request.id)
+                continue
+            
+            if open_seats is None or open_seats > 0:
+                new_status, queue_key = RoomMemberStatus.ACTIVE, None
+                if open_seats is not None:
+                    open_seats -= 1
+                activated.append(request.id)
+            elif old_status == RoomMemberStatus.WAITLISTED:
+                # Keep their place in line
+                new_status, queue_key = RoomMemberStatus.WAITLISTED, old.queue_key
+                waitlisted.append(request.id)
+            else:
+                new_status, queue_key = RoomMemberStatus.WAITLISTED, queue_key_seq.next_value()
+                waitlisted.append(request.id)
+            
+            active_delta += int(new_status == RoomMemberStatus.ACTIVE) - int(old_status == RoomMemberStatus.ACTIVE)
+            waitlist_delta += int(new_status == RoomMemberStatus.WAITLISTED) - int(old_status == RoomMemberStatus.WAITLISTED)
+            members.append({
+                "user_id": request.user_id,
+                "room_id": room.id,
+                "is_host": False,
+                "status": new_status,
+                "queue_key": queue_key,
+                "joined_at": now,
+                "left_at": None,
+                "created_at": now,
+                "updated_at": now,
+            })
+        
+        if members:
+            # One INSERT for every approved requester; rows that already exist
+            # are switched over in place (re-seated members get a new joined_at)
+            stmt = pg_insert(RoomMemberModel).values(members)
+            await db.execute(stmt.on_conflict_do_update(
+                constraint="uq_room_member_user_room",
+                set_={
+                    "status": stmt.excluded.status,
+                    "queue_key": stmt.excluded.queue_key,
+                    "joined_at": case(
+                        (stmt.excluded.status == RoomMemberStatus.ACTIVE, stmt.excluded.joined_at),
+                        else_=RoomMemberModel.joined_at
+                    ),
+                    "left_at": None,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            ))
+        await adjust_room_counters(db, room.id, active_delta, waitlist_delta)
+    
+    if decided_ids:
+        await db.execute(
+            update(JoinRequestModel).where(
+                JoinRequestModel.id.in_(decided_ids)
+            ).values(
+                status=case(
+                    (JoinRequestModel.id.in_(approve_ids), literal(JoinRequestStatus.APPROVED, JoinRequestModel.status.type)),
+                    else_=literal(JoinRequestStatus.REJECTED, JoinRequestModel.status.type)
+                ),
+                updated_at=datetime.utcnow()
+            )
+        )
+        await notify_join_requests(db, decided_ids)
+        await notify_memberships(db, room.id, [row.user_id for row in approved])
+    
+    await db.commit()
+    invalidate_discovery_cache()
+    
+    return JoinRequestBulkDecideResult(
+        room_id=room.id,
+        activated=activated,
+        waitlisted=waitlisted,
+        rejected=rejected,
+        skipped=skipped
+    )
+
+
 @router.delete("/{request_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_join_request(
     request_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Cancel a pending join request (requester only)"""
-    join_request = db.query(JoinRequestModel).filter(
+    join_request = await db.scalar(select(JoinRequestModel).where(
         JoinRequestModel.id == request_id
-    ).first()
+    ))
     
     if not join_request:
         raise HTTPException(
@@ -311,7 +487,101 @@ async def cancel_join_request(
         )
     
     join_request.status = JoinRequestStatus.CANCELLED
-    db.commit()
+    await db.commit()
+
+
+@router.get("/rooms/{room_id}/inbox", response_model=List[JoinRequestInboxItem])
+async def get_room_inbox(
+    room_id: int,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(DEFAULT_INBOX_LIMIT, ge=1, le=MAX_INBOX_LIMIT),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Pending join requests for a room, oldest first (host only).
+    
+    Each request carries the requester's username, skill level and cached
+    reputation, so the host can decide without fetching profiles. Pages
+    are keyed on (created_at, id): when more requests remain, the
+    X-Next-Cursor header holds the cursor for the next page.
+    
+    The host check and the page come from one query: it starts from the
+    room and outer joins the page, so an empty inbox still returns the
+    room's host_id.
+    """
+    page_filter = and_(
+        JoinRequestModel.room_id == RoomModel.id,
+        JoinRequestModel.status == JoinRequestStatus.PENDING
+    )
+    if cursor:
+        try:
+            after_created_at, after_id = decode_cursor(cursor, "join_inbox")
+            after = (datetime.fromisoformat(after_created_at), int(after_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        page_filter = and_(page_filter, tuple_(JoinRequestModel.created_at, JoinRequestModel.id) > after)
+    
+    rows = (await db.execute(
+        select(
+            RoomModel.host_id,
+            JoinRequestModel,
+            UserModel.username,
+            UserModel.skill_level,
+            UserModel.avg_rating,
+            UserModel.review_count,
+            UserModel.games_completed,
+        ).select_from(RoomModel).outerjoin(
+            JoinRequestModel, page_filter
+        ).outerjoin(
+            UserModel, UserModel.id == JoinRequestModel.user_id
+        ).where(
+            RoomModel.id == room_id
+        ).order_by(
+            JoinRequestModel.created_at,
+            JoinRequestModel.id
+        ).limit(limit + 1)
+    )).all()
+    
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+    
+    if rows[0].host_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the room host can view join requests"
+        )
+    
+    rows = [row for row in rows if row.JoinRequest is not None]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1].JoinRequest
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor("join_inbox", [last.created_at.isoformat(), last.id])
+    
+    return [
+        JoinRequestInboxItem(
+            id=row.JoinRequest.id,
+            user_id=row.JoinRequest.user_id,
+            room_id=row.JoinRequest.room_id,
+            status=row.JoinRequest.status,
+            message=row.JoinRequest.message,
+            created_at=row.JoinRequest.created_at,
+            updated_at=row.JoinRequest.updated_at,
+            username=row.username,
+            skill_level=row.skill_level,
+            avg_rating=row.avg_rating or 0.0,
+            review_count=row.review_count or 0,
+            games_completed=row.games_completed or 0
+        )
+        for row in rows
+    ]
 
 
 # =============================================================================
@@ -321,15 +591,15 @@ async def cancel_join_request(
 @router.get("/rooms/{room_id}/waitlist")
 async def get_room_waitlist(
     room_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get the waitlist for a room (host only).
     Returns waitlisted members ordered by queue position.
     """
     # Check room exists
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -343,26 +613,28 @@ async def get_room_waitlist(
             detail="Only the room host can view the waitlist"
         )
     
-    waitlist = db.query(RoomMemberModel).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.status == RoomMemberStatus.WAITLISTED
-    ).order_by(
-        RoomMemberModel.queue_position.asc()
-    ).all()
+    waitlist = (await db.scalars(
+        select(RoomMemberModel).where(
+            RoomMemberModel.room_id == room_id,
+            RoomMemberModel.status == RoomMemberStatus.WAITLISTED
+        ).order_by(
+            RoomMemberModel.queue_key.asc()
+        )
+    )).all()
     
     return {
         "room_id": room_id,
         "max_players": room.max_players,
-        "active_count": get_active_member_count(db, room_id),
+        "active_count": room.active_member_count,
         "waitlist_count": len(waitlist),
         "waitlist": [
             {
                 "id": member.id,
                 "user_id": member.user_id,
-                "queue_position": member.queue_position,
+                "queue_position": position,
                 "joined_at": member.joined_at
             }
-            for member in waitlist
+            for position, member in enumerate(waitlist, start=1)
         ]
     }
 
@@ -371,18 +643,18 @@ async def get_room_waitlist(
 async def promote_from_waitlist(
     room_id: int,
     member_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Promote a waitlisted user to active member (host only).
     
     Rules:
-    - User must be first in queue (queue_position = 1)
+    - User must be first in queue (no waitlisted member with a lower queue key)
     - Room must have available space
     """
-    # Check room exists
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    # Check room exists (locked, like approvals, so seats can't be double-filled)
+    room = await lock_room(db, room_id)
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -397,10 +669,10 @@ async def promote_from_waitlist(
         )
     
     # Get the member
-    member = db.query(RoomMemberModel).filter(
+    member = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.id == member_id,
         RoomMemberModel.room_id == room_id
-    ).first()
+    ))
     
     if not member:
         raise HTTPException(
@@ -416,14 +688,15 @@ async def promote_from_waitlist(
         )
     
     # Must be first in queue
-    if member.queue_position != 1:
+    queue_position = await get_waitlist_position(db, room_id, member.queue_key)
+    if queue_position != 1:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User is at position {member.queue_position} in queue. Only the user at position 1 can be promoted."
+            detail=f"User is at position {queue_position} in queue. Only the user at position 1 can be promoted."
         )
     
     # Check room has space
-    active_count = get_active_member_count(db, room_id)
+    active_count = await get_active_member_count(db, room_id)
     if room.max_players is not None and active_count >= room.max_players:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -432,14 +705,17 @@ async def promote_from_waitlist(
     
     # Promote the member
     member.status = RoomMemberStatus.ACTIVE
-    member.queue_position = None
+    member.queue_key = None
     member.joined_at = datetime.utcnow()
     
-    # Reorder remaining queue
-    reorder_queue_after_removal(db, room_id, 1)
+    await record_member_transition(db, room_id, RoomMemberStatus.WAITLISTED, RoomMemberStatus.ACTIVE)
+    await db.flush()
+    await notify_memberships(db, room_id, [member.user_id])
+    await notify_waitlist_positions(db, room_id)
     
-    db.commit()
-    db.refresh(member)
+    await db.commit()
+    invalidate_discovery_cache()
+    await db.refresh(member)
     
     return {
         "message": "User promoted to active member",
@@ -453,16 +729,17 @@ async def promote_from_waitlist(
 async def remove_from_waitlist(
     room_id: int,
     member_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Remove a user from the waitlist (host only).
     
-    This removes the user from the waitlist and reorders remaining positions.
+    This removes the user from the waitlist; everyone behind them moves up
+    one position without their rows being touched.
     """
-    # Check room exists
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    # Check room exists (locked, so a concurrent promotion can't seat this member meanwhile)
+    room = await lock_room(db, room_id)
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -476,11 +753,11 @@ async def remove_from_waitlist(
             detail="Only the room host can remove users from the waitlist"
         )
     
-    # Get the member
-    member = db.query(RoomMemberModel).filter(
+    # Get the member, re-read under the room lock
+    member = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.id == member_id,
         RoomMemberModel.room_id == room_id
-    ).first()
+    ).with_for_update().execution_options(populate_existing=True))
     
     if not member:
         raise HTTPException(
@@ -495,19 +772,18 @@ async def remove_from_waitlist(
             detail="User is not on the waitlist"
         )
     
-    # Store the position before removal
-    removed_position = member.queue_position
-    
     # Update member status to REMOVED
     member.status = RoomMemberStatus.REMOVED
-    member.queue_position = None
+    member.queue_key = None
     member.left_at = datetime.utcnow()
     
-    # Reorder remaining queue positions
-    if removed_position:
-        reorder_queue_after_removal(db, room_id, removed_position)
+    await record_member_transition(db, room_id, RoomMemberStatus.WAITLISTED, RoomMemberStatus.REMOVED)
+    await db.flush()
+    await notify_memberships(db, room_id, [member.user_id])
+    await notify_waitlist_positions(db, room_id)
     
-    db.commit()
+    await db.commit()
+    invalidate_discovery_cache()
     
     return {
         "message": "User removed from waitlist",
@@ -519,14 +795,14 @@ async def remove_from_waitlist(
 @router.get("/rooms/{room_id}/waitlist/position")
 async def get_my_waitlist_position(
     room_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current user's position in the waitlist for a room.
     """
     # Check room exists
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -534,10 +810,10 @@ async def get_my_waitlist_position(
         )
     
     # Get user's membership
-    member = db.query(RoomMemberModel).filter(
+    member = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.room_id == room_id,
         RoomMemberModel.user_id == current_user.id
-    ).first()
+    ))
     
     if not member:
         raise HTTPException(
@@ -551,16 +827,14 @@ async def get_my_waitlist_position(
             "message": "You are an active member of this room"
         }
     elif member.status == RoomMemberStatus.WAITLISTED:
-        total_waitlisted = db.query(RoomMemberModel).filter(
-            RoomMemberModel.room_id == room_id,
-            RoomMemberModel.status == RoomMemberStatus.WAITLISTED
-        ).count()
+        queue_position = await get_waitlist_position(db, room_id, member.queue_key)
+        total_waitlisted = room.waitlist_count
         
         return {
             "status": "waitlisted",
-            "queue_position": member.queue_position,
+            "queue_position": queue_position,
             "total_in_queue": total_waitlisted,
-            "message": f"You are #{member.queue_position} of {total_waitlisted} in the waitlist"
+            "message": f"You are #{queue_position} of {total_waitlisted} in the waitlist"
         }
     else:
         return {
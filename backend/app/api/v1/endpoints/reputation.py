@@ -5,12 +5,12 @@ Handles user reviews and reputation management for the poker social app.
 Reviews can only be submitted after a room is finished.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.schemas.review import (
     Review,
     ReviewCreateForRoom,
@@ -21,12 +21,12 @@ from app.models.review import Review as ReviewModel
 from app.models.room import Room as RoomModel, RoomStatus
 from app.models.room_member import RoomMember as RoomMemberModel, RoomMemberStatus
 from app.models.user import User as UserModel
-from app.utils.auth import get_current_user
+from app.utils.auth import Principal, get_current_user
 
 router = APIRouter()
 
 
-def was_room_participant(db: Session, user_id: int, room_id: int) -> bool:
+async def was_room_participant(db: AsyncSession, user_id: int, room_id: int) -> bool:
     """
     Check if a user was a participant in the room (either as host or member).
     
@@ -34,20 +34,20 @@ def was_room_participant(db: Session, user_id: int, room_id: int) -> bool:
     they can still submit reviews for a finished room.
     """
     # Check if user is the host
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     if room and room.host_id == user_id:
         return True
     
     # Check if user was ever a member (any status)
-    member = db.query(RoomMemberModel).filter(
+    member = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.user_id == user_id,
         RoomMemberModel.room_id == room_id
-    ).first()
+    ))
     
     return member is not None
 
 
-def update_user_reputation_cache(db: Session, user_id: int) -> None:
+async def update_user_reputation_cache(db: AsyncSession, user_id: int) -> None:
     """
     Update the cached reputation fields on the user table.
     
@@ -55,29 +55,33 @@ def update_user_reputation_cache(db: Session, user_id: int) -> None:
     Called after a new review is submitted.
     """
     # Calculate aggregates from reviews
-    result = db.query(
-        func.count(ReviewModel.id).label('count'),
-        func.coalesce(func.avg(ReviewModel.rating), 0).label('avg')
-    ).filter(
-        ReviewModel.target_user_id == user_id
-    ).first()
+    result = (await db.execute(
+        select(
+            func.count(ReviewModel.id).label('count'),
+            func.coalesce(func.avg(ReviewModel.rating), 0).label('avg')
+        ).where(
+            ReviewModel.target_user_id == user_id
+        )
+    )).first()
     
     review_count = result.count or 0
     avg_rating = float(result.avg or 0)
     
     # Update user's cached fields
-    db.query(UserModel).filter(UserModel.id == user_id).update({
-        "review_count": review_count,
-        "avg_rating": round(avg_rating, 2)
-    })
+    await db.execute(
+        update(UserModel).where(UserModel.id == user_id).values(
+            review_count=review_count,
+            avg_rating=round(avg_rating, 2)
+        )
+    )
 
 
 @router.post("/rooms/{room_id}/reviews", response_model=Review, status_code=status.HTTP_201_CREATED)
 async def create_review(
     room_id: int,
     review_data: ReviewCreateForRoom,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a review for a user in a finished room.
@@ -95,7 +99,7 @@ async def create_review(
     - Room members can review other room members
     """
     # Get the room
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,14 +114,14 @@ async def create_review(
         )
     
     # Check reviewer was a participant
-    if not was_room_participant(db, current_user.id, room_id):
+    if not await was_room_participant(db, current_user.id, room_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You must have been a participant in this room to submit a review"
         )
     
     # Check target user exists
-    target_user = db.query(UserModel).filter(UserModel.id == review_data.target_user_id).first()
+    target_user = await db.scalar(select(UserModel).where(UserModel.id == review_data.target_user_id))
     if not target_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,7 +129,7 @@ async def create_review(
         )
     
     # Check target was a participant
-    if not was_room_participant(db, review_data.target_user_id, room_id):
+    if not await was_room_participant(db, review_data.target_user_id, room_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Target user was not a participant in this room"
@@ -139,11 +143,11 @@ async def create_review(
         )
     
     # Check if review already exists (also enforced by DB unique constraint)
-    existing_review = db.query(ReviewModel).filter(
+    existing_review = await db.scalar(select(ReviewModel).where(
         ReviewModel.room_id == room_id,
         ReviewModel.reviewer_id == current_user.id,
         ReviewModel.target_user_id == review_data.target_user_id
-    ).first()
+    ))
     
     if existing_review:
         raise HTTPException(
@@ -161,12 +165,12 @@ async def create_review(
     )
     
     db.add(review)
-    db.commit()
-    db.refresh(review)
+    await db.commit()
+    await db.refresh(review)
     
     # Update target user's reputation cache
-    update_user_reputation_cache(db, review_data.target_user_id)
-    db.commit()
+    await update_user_reputation_cache(db, review_data.target_user_id)
+    await db.commit()
     
     return review
 
@@ -176,7 +180,7 @@ async def get_room_reviews(
     room_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all reviews for a specific room.
@@ -184,18 +188,20 @@ async def get_room_reviews(
     Returns reviews submitted by participants after the room finished.
     """
     # Check room exists
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
     
-    reviews = db.query(ReviewModel).filter(
-        ReviewModel.room_id == room_id
-    ).order_by(
-        ReviewModel.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    reviews = (await db.scalars(
+        select(ReviewModel).where(
+            ReviewModel.room_id == room_id
+        ).order_by(
+            ReviewModel.created_at.desc()
+        ).offset(skip).limit(limit)
+    )).all()
     
     return reviews
 
@@ -205,7 +211,7 @@ async def get_user_reputation(
     user_id: int,
     include_recent_reviews: bool = Query(True, description="Include recent reviews in response"),
     recent_limit: int = Query(5, ge=1, le=20, description="Number of recent reviews to include"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a user's reputation summary.
@@ -218,7 +224,7 @@ async def get_user_reputation(
     - Recent reviews (optional)
     """
     # Check user exists
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    user = await db.scalar(select(UserModel).where(UserModel.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -226,14 +232,16 @@ async def get_user_reputation(
         )
     
     # Get rating breakdown (count of each rating 1-5)
-    rating_counts = db.query(
-        ReviewModel.rating,
-        func.count(ReviewModel.id).label('count')
-    ).filter(
-        ReviewModel.target_user_id == user_id
-    ).group_by(
-        ReviewModel.rating
-    ).all()
+    rating_counts = (await db.execute(
+        select(
+            ReviewModel.rating,
+            func.count(ReviewModel.id).label('count')
+        ).where(
+            ReviewModel.target_user_id == user_id
+        ).group_by(
+            ReviewModel.rating
+        )
+    )).all()
     
     # Build rating breakdown dict with all ratings 1-5
     rating_breakdown = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
@@ -243,11 +251,13 @@ async def get_user_reputation(
     # Get recent reviews if requested
     recent_reviews = []
     if include_recent_reviews:
-        reviews = db.query(ReviewModel).filter(
-            ReviewModel.target_user_id == user_id
-        ).order_by(
-            ReviewModel.created_at.desc()
-        ).limit(recent_limit).all()
+        reviews = (await db.scalars(
+            select(ReviewModel).where(
+                ReviewModel.target_user_id == user_id
+            ).order_by(
+                ReviewModel.created_at.desc()
+            ).limit(recent_limit)
+        )).all()
         
         recent_reviews = [
             {
@@ -278,7 +288,7 @@ async def get_user_reviews(
     review_type: str = Query("received", description="Type of reviews: 'received' or 'given'"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get reviews for a user.
@@ -287,7 +297,7 @@ async def get_user_reviews(
     - review_type='given': Reviews written by this user
     """
     # Check user exists
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    user = await db.scalar(select(UserModel).where(UserModel.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -295,17 +305,21 @@ async def get_user_reviews(
         )
     
     if review_type == "received":
-        reviews = db.query(ReviewModel).filter(
-            ReviewModel.target_user_id == user_id
-        ).order_by(
-            ReviewModel.created_at.desc()
-        ).offset(skip).limit(limit).all()
+        reviews = (await db.scalars(
+            select(ReviewModel).where(
+                ReviewModel.target_user_id == user_id
+            ).order_by(
+                ReviewModel.created_at.desc()
+            ).offset(skip).limit(limit)
+        )).all()
     elif review_type == "given":
-        reviews = db.query(ReviewModel).filter(
-            ReviewModel.reviewer_id == user_id
-        ).order_by(
-            ReviewModel.created_at.desc()
-        ).offset(skip).limit(limit).all()
+        reviews = (await db.scalars(
+            select(ReviewModel).where(
+                ReviewModel.reviewer_id == user_id
+            ).order_by(
+                ReviewModel.created_at.desc()
+            ).offset(skip).limit(limit)
+        )).all()
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
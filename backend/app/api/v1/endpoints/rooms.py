@@ -1,19 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Header
+from sqlalchemy import and_, case, func, literal_column, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Union
+import hashlib
+import math
 from datetime import datetime
 from geoalchemy2.functions import ST_DWithin, ST_Distance, ST_MakePoint, ST_SetSRID
 
-from app.core.database import get_db
-from app.schemas.room import Room, RoomCreate, RoomUpdate, RoomWithDistance, RoomPublic, RoomPrivate, RoomStatusUpdate, GameType, GameFormat
+from app.core.database import get_db, get_read_db
+from app.schemas.room import Room, RoomCreate, RoomUpdate, RoomWithDistance, RoomPublic, RoomPrivate, RoomCluster, RoomStatusUpdate, GameType, GameFormat
 from app.models.room import Room as RoomModel, RoomStatus
 from app.models.room_member import RoomMember as RoomMemberModel, RoomMemberStatus
 from app.models.user import User
-from app.utils.auth import get_current_user
+from app.schemas.room_member import RoomRosterMember
+from app.utils.auth import Principal, get_current_user
 from app.utils.location import generate_public_location, create_postgis_point_wkt
+from app.utils.discovery_cache import (
+    CLUSTER_CACHE_TTL_SECONDS,
+    DISCOVERY_CACHE_TTL_SECONDS,
+    cluster_cache,
+    discovery_cache,
+    invalidate_discovery_cache,
+    may_cache_from,
+    may_read_cache,
+    quantize_origin,
+    quantize_radius,
+)
+from app.utils.events import notify_memberships, notify_room_status, notify_waitlist_positions
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.utils.room_counters import record_member_transition
+from app.utils.waitlist import lock_room, promote_waitlist_heads
 from app.utils.location_security import (
-    fuzz_distance,
+    fuzz_distances,
+    fuzz_origin_cell,
+    seconds_until_next_fuzz_epoch,
     log_private_location_access,
     verify_room_membership,
     clamp_minimum_distance,
@@ -26,6 +46,22 @@ MAX_RADIUS_METERS = 100000
 DEFAULT_RADIUS_METERS = 10000
 MAX_RESULTS = 50
 DEFAULT_LIMIT = 20
+MAX_VIEWPORT_PINS = 200
+DEFAULT_VIEWPORT_PINS = 100
+VIEWPORT_TRUNCATED_HEADER = "X-Viewport-Truncated"
+
+# Server-side pin clustering
+CLUSTER_CELL_PIXELS = 64            # Grid cell size on screen, at every zoom level
+MAX_CLUSTER_ZOOM = 20
+MAX_CLUSTER_CELLS = 1024            # Guard against viewports far larger than the zoom implies
+
+# Vector tiles of room pins
+MAX_TILE_ZOOM = 22
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# Room rosters (tournaments can be large)
+DEFAULT_ROSTER_LIMIT = 100
+MAX_ROSTER_LIMIT = 500
 
 
 def _room_base_dict(room) -> dict:
@@ -39,6 +75,7 @@ def _room_base_dict(room) -> dict:
         "buy_in_min": room.buy_in_min,
         "buy_in_max": room.buy_in_max,
         "max_players": room.max_players,
+        "auto_promote_waitlist": room.auto_promote_waitlist,
         "skill_level": room.skill_level,
         "game_type": room.game_type,
         "game_format": room.game_format,
@@ -54,32 +91,183 @@ def _room_base_dict(room) -> dict:
     }
 
 
-def _get_member_count(db: Session, room_id: int) -> int:
-    """Count active members for a room (includes host)."""
-    return db.query(func.count(RoomMemberModel.id)).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.status == RoomMemberStatus.ACTIVE
-    ).scalar() or 0
+def _room_read_query(*extra_columns):
+    """
+    Room read model: base fields plus public lat/lon.
+
+    Everything a room response needs comes back from a single statement, so
+    endpoints never issue per-room follow-up queries. Member and waitlist
+    counts are the denormalized counters on the room row itself. Extra
+    labelled columns (e.g. a distance expression) can be appended by the caller.
+
+    Rooms already in the session are refreshed from the row (sessions don't
+    expire objects on commit), so responses built right after a write include
+    server-computed columns such as has_open_seats.
+    """
+    public_geom = func.geometry(RoomModel.public_location)
+    return select(
+        RoomModel,
+        func.ST_Y(public_geom).label("public_latitude"),
+        func.ST_X(public_geom).label("public_longitude"),
+        *extra_columns
+    ).execution_options(populate_existing=True)
+
+
+def _discovery_filters(
+    game_type: Optional[str],
+    game_format: Optional[str],
+    buy_in_min: Optional[int],
+    buy_in_max: Optional[int],
+    has_seats: Optional[bool]
+) -> list:
+    """Filter conditions shared by the discovery endpoints (active rooms + poker filters)."""
+    filters = [RoomModel.is_active == True]
+
+    if game_type:
+        filters.append(RoomModel.game_type == game_type)
+    if game_format:
+        filters.append(RoomModel.game_format == game_format)
+    if buy_in_min is not None:
+        filters.append(RoomModel.buy_in_max >= buy_in_min)
+    if buy_in_max is not None:
+        filters.append(RoomModel.buy_in_min <= buy_in_max)
+
+    # Availability: indexed generated column maintained with the seat counters
+    if has_seats is True:
+        filters.append(RoomModel.has_open_seats.is_(True))
+
+    return filters
+
+
+def _viewport_filter(min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+    """
+    Bounding-box test of public_location against a map viewport.
+    
+    The test runs in geometry (plain lon/lat) space with `&&`, answered by the
+    GiST index on geometry(public_location). A geography envelope would follow
+    great circles, so edges bow away from the lines of latitude and viewports
+    180° or wider select the wrong side of the globe. A viewport crossing the
+    antimeridian (min_lon > max_lon) is split into two boxes.
+    """
+    def overlaps(west: float, east: float):
+        envelope = func.ST_MakeEnvelope(west, min_lat, east, max_lat, 4326)
+        return func.geometry(RoomModel.public_location).op("&&")(envelope)
+    
+    if min_lon <= max_lon:
+        return overlaps(min_lon, max_lon)
+    return or_(overlaps(min_lon, 180), overlaps(-180, max_lon))
+
+
+def _cluster_cell_degrees(zoom: int) -> float:
+    """Grid cell size in degrees: CLUSTER_CELL_PIXELS of a 256px web-map tile at this zoom."""
+    return 360.0 / (2 ** zoom) * CLUSTER_CELL_PIXELS / 256
+
+
+async def _compute_clusters(db: AsyncSession, filters: list, cell: float, xs: range, ys: range) -> dict:
+    """
+    Aggregate active rooms per grid cell over a rectangular range of cells.
+    
+    Cells are fixed globally (floor(lon / cell), floor(lat / cell)), so a
+    cell's aggregate doesn't depend on the viewport it was requested for.
+    
+    Returns:
+        Dict mapping (cell_x, cell_y) to a cluster dict, for non-empty cells only
+    """
+    geom = func.geometry(RoomModel.public_location)
+    lon = func.ST_X(geom)
+    lat = func.ST_Y(geom)
+    cell_x = func.floor(lon / cell).label("cell_x")
+    cell_y = func.floor(lat / cell).label("cell_y")
+    
+    # Index-backed box over the cells; exact cell membership is in the predicate
+    west, east = xs.start * cell, xs.stop * cell
+    south, north = ys.start * cell, ys.stop * cell
+    bbox = _viewport_filter(max(south, -90), max(west, -180), min(north, 90), min(east, 180))
+    
+    rows = (await db.execute(select(
+        cell_x,
+        cell_y,
+        func.count(RoomModel.id).label("room_count"),
+        func.count(RoomModel.id).filter(RoomModel.has_open_seats.is_(True)).label("open_seat_count"),
+        func.avg(lat).label("latitude"),
+        func.avg(lon).label("longitude"),
+        *[
+            func.count(RoomModel.id).filter(RoomModel.game_type == game_type.value).label(game_type.value)
+            for game_type in GameType
+        ]
+    ).where(
+        *filters,
+        RoomModel.public_location.isnot(None),
+        bbox,
+        cell_x.element.between(xs.start, xs.stop - 1),
+        cell_y.element.between(ys.start, ys.stop - 1)
+    ).group_by(
+        # Group by output column name so drivers with positional parameters
+        # don't produce a GROUP BY expression that differs from the SELECT list
+        literal_column("cell_x"),
+        literal_column("cell_y")
+    ))).all()
+    
+    clusters = {}
+    for row in rows:
+        clusters[(int(row.cell_x), int(row.cell_y))] = {
+            "latitude": float(row.latitude),
+            "longitude": float(row.longitude),
+            "room_count": row.room_count,
+            "open_seat_count": row.open_seat_count,
+            "game_types": {
+                game_type.value: getattr(row, game_type.value)
+                for game_type in GameType
+                if getattr(row, game_type.value)
+            },
+        }
+    return clusters
+
+
+def _decode_room_cursor(cursor: str, kind: str) -> tuple:
+    """Decode a discovery cursor into its (sort key, room id) pair, or 400."""
+    try:
+        key, room_id = decode_cursor(cursor, kind)
+        if kind == "time":
+            key = datetime.fromisoformat(key)
+        else:
+            key = float(key)
+        return key, int(room_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _float_or_none(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _room_read_dict(row) -> dict:
+    """Build the public response dict from a `_room_read_query` row."""
+    room = row[0]
+    return {
+        **_room_base_dict(room),
+        "public_latitude": _float_or_none(row.public_latitude),
+        "public_longitude": _float_or_none(row.public_longitude),
+        "member_count": room.active_member_count,
+        "waitlist_count": room.waitlist_count,
+        "has_open_seats": room.has_open_seats,
+    }
 
 
-def _extract_public_coords(db, room) -> tuple[float | None, float | None]:
-    """Extract public lat/lon from a PostGIS geography column."""
-    if not room.public_location:
-        return None, None
-    row = db.execute(
-        text("SELECT ST_X(public_location::geometry), ST_Y(public_location::geometry) FROM rooms WHERE id = :id"),
-        {"id": room.id},
-    ).fetchone()
-    if row:
-        return float(row[1]), float(row[0])
-    return None, None
+async def _get_room_read(db: AsyncSession, room_id: int) -> Optional[dict]:
+    """Load a single room through the read model, or None if it doesn't exist."""
+    row = (await db.execute(_room_read_query().where(RoomModel.id == room_id))).first()
+    return _room_read_dict(row) if row else None
 
 
 @router.post("/", response_model=RoomPublic, status_code=status.HTTP_201_CREATED)
 async def create_room(
     room_data: RoomCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new room.
@@ -95,6 +283,7 @@ async def create_room(
         buy_in_min=room_data.buy_in_min,
         buy_in_max=room_data.buy_in_max,
         max_players=room_data.max_players,
+        auto_promote_waitlist=room_data.auto_promote_waitlist,
         skill_level=room_data.skill_level,
         scheduled_at=room_data.scheduled_at,
         game_type=room_data.game_type,
@@ -117,24 +306,16 @@ async def create_room(
         room.public_location = public_location_wkt
     
     db.add(room)
-    db.commit()
-    db.refresh(room)
-    
-    pub_lat, pub_lon = _extract_public_coords(db, room)
-    response = {
-        **_room_base_dict(room),
-        "public_latitude": pub_lat,
-        "public_longitude": pub_lon,
-        "member_count": _get_member_count(db, room.id),
-    }
+    await db.commit()
+    invalidate_discovery_cache()
     
-    return RoomPublic(**response)
+    return RoomPublic(**await _get_room_read(db, room.id))
 
 
 @router.get("/my-rooms", response_model=List[RoomPublic])
 async def get_my_rooms(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all rooms the current user is hosting or is an active member of.
@@ -145,39 +326,31 @@ async def get_my_rooms(
     
     Includes both past and upcoming games.
     """
-    from sqlalchemy import or_
-    
     # Get room IDs where user is an active member
-    member_room_ids = db.query(RoomMemberModel.room_id).filter(
+    member_room_ids = select(RoomMemberModel.room_id).where(
         RoomMemberModel.user_id == current_user.id,
         RoomMemberModel.status == RoomMemberStatus.ACTIVE
-    ).subquery()
+    )
     
     # Query rooms where user is host OR active member
-    rooms = db.query(RoomModel).filter(
-        or_(
-            RoomModel.host_id == current_user.id,
-            RoomModel.id.in_(member_room_ids)
-        )
-    ).order_by(RoomModel.created_at.desc()).all()
-    
-    result = []
-    for room in rooms:
-        pub_lat, pub_lon = _extract_public_coords(db, room)
-        room_data = {
-            **_room_base_dict(room),
-            "public_latitude": pub_lat,
-            "public_longitude": pub_lon,
-            "is_host": room.host_id == current_user.id,
-            "member_count": _get_member_count(db, room.id),
-        }
-        result.append(RoomPublic(**room_data))
+    rows = (await db.execute(
+        _room_read_query().where(
+            or_(
+                RoomModel.host_id == current_user.id,
+                RoomModel.id.in_(member_room_ids)
+            )
+        ).order_by(RoomModel.created_at.desc())
+    )).all()
     
-    return result
+    return [
+        RoomPublic(**_room_read_dict(row), is_host=row[0].host_id == current_user.id)
+        for row in rows
+    ]
 
 
 @router.get("/", response_model=List[RoomWithDistance])
 async def list_rooms(
+    response: Response,
     latitude: Optional[float] = Query(None, ge=-90, le=90, description="User's latitude"),
     longitude: Optional[float] = Query(None, ge=-180, le=180, description="User's longitude"),
     address: Optional[str] = Query(None, min_length=2, max_length=200, description="Address to search (geocoded to coordinates)"),
@@ -187,9 +360,11 @@ async def list_rooms(
     buy_in_min: Optional[int] = Query(None, ge=0, description="Minimum buy-in filter"),
     buy_in_max: Optional[int] = Query(None, ge=0, description="Maximum buy-in filter"),
     has_seats: Optional[bool] = Query(None, description="Filter rooms with available seats"),
-    skip: int = Query(0, ge=0, description="Number of results to skip"),
+    nearest: bool = Query(False, description="Return the closest rooms with no radius cap (requires a location)"),
+    skip: int = Query(0, ge=0, description="Number of results to skip (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_RESULTS, description="Maximum results to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List active rooms with optional geospatial and poker-specific filtering.
@@ -203,13 +378,38 @@ async def list_rooms(
     - game_format: cash, tournament
     - buy_in_min / buy_in_max: dollar range for buy-in (informational)
     - has_seats: true to only show rooms with open seats
+    
+    Nearest mode (nearest=true):
+    - Returns the `limit` closest rooms at any distance, ignoring `radius`
+    - Ordered by the PostGIS <-> operator, which walks the GiST index on
+      public_location instead of distance-sorting every match in a radius
+    - Always a single page (no cursor)
+    
+    Pagination:
+    - Geo results are ordered by (distance, id), others by
+      (scheduled_at or created_at, id), newest first
+    - When a full page is returned, the X-Next-Cursor header carries an opaque
+      cursor; pass it back as `cursor` to fetch the next page at constant cost
+    
+    Caching:
+    - The search origin is snapped to a ~500m grid and the radius rounded up
+      to 100m, so nearby users with the same filters share results
+    - First pages are cached briefly and invalidated by room/membership writes;
+      distance fuzzing is applied to every response, keyed on the snapped
+      origin and stable within a fuzzing epoch
     """
-    from app.utils.geocoding import geocode_address
+    from app.utils.geocoding import geocode_address_async, GeocodingUnavailableError
     
     limit = min(limit, MAX_RESULTS)
     
     if address and latitude is None and longitude is None:
-        coords = geocode_address(address)
+        try:
+            coords = await geocode_address_async(address)
+        except GeocodingUnavailableError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Address search is temporarily unavailable, please try again shortly"
+            )
         if coords:
             latitude, longitude = coords
         else:
@@ -218,145 +418,409 @@ async def list_rooms(
                 detail=f"Could not find location for address: {address}"
             )
     
-    # Build base filter conditions
-    filters = [RoomModel.is_active == True]
-
-    if game_type:
-        filters.append(RoomModel.game_type == game_type)
-    if game_format:
-        filters.append(RoomModel.game_format == game_format)
-    if buy_in_min is not None:
-        filters.append(RoomModel.buy_in_max >= buy_in_min)
-    if buy_in_max is not None:
-        filters.append(RoomModel.buy_in_min <= buy_in_max)
-
-    # Availability: subquery to count active members per room
-    member_count_subq = (
-        db.query(
-            RoomMemberModel.room_id,
-            func.count(RoomMemberModel.id).label("member_count")
+    if nearest and (latitude is None or longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="nearest requires latitude/longitude or an address"
         )
-        .filter(RoomMemberModel.status == RoomMemberStatus.ACTIVE)
-        .group_by(RoomMemberModel.room_id)
-        .subquery()
+    
+    filter_key = (game_type, game_format, buy_in_min, buy_in_max, has_seats)
+    has_location = latitude is not None and longitude is not None
+    
+    if has_location:
+        # Snap the origin (for every page, so cursors stay consistent) and
+        # round the radius up, so nearby users share cache entries
+        latitude, longitude = quantize_origin(latitude, longitude)
+        radius = min(quantize_radius(radius or DEFAULT_RADIUS_METERS), MAX_RADIUS_METERS)
+        if nearest:
+            cache_key = ("nearest", latitude, longitude, filter_key, limit)
+        else:
+            cache_key = ("geo", latitude, longitude, radius, filter_key, skip, limit)
+    else:
+        cache_key = ("time", filter_key, skip, limit)
+    
+    # Cursor pages are always computed; first pages come from the cache when possible
+    page = discovery_cache.get(cache_key) if not cursor and may_read_cache(db.info) else None
+    if page is None:
+        filters = _discovery_filters(game_type, game_format, buy_in_min, buy_in_max, has_seats)
+        if has_location:
+            page = await _geo_discovery_page(db, filters, latitude, longitude, radius, nearest, cursor, skip, limit)
+        else:
+            page = await _time_discovery_page(db, filters, cursor, skip, limit)
+        if not cursor and may_cache_from(db.info):
+            discovery_cache.set(cache_key, page)
+    
+    rows, next_cursor_key = page
+    if next_cursor_key:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cache_key[0], next_cursor_key)
+    
+    # Privacy noise is applied per response, never to cached rows. It is keyed
+    # on the room, the epoch and a coarse origin cell (see fuzz_distance)
+    safe_distances = fuzz_distances(
+        [clamp_minimum_distance(distance) for _, distance in rows],
+        [room_dict["id"] for room_dict, _ in rows],
+        fuzz_origin_cell(latitude, longitude) if has_location else ""
     )
+    
+    # Stable until the next write or fuzz epoch, whichever comes first
+    max_age = min(DISCOVERY_CACHE_TTL_SECONDS, seconds_until_next_fuzz_epoch())
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    
+    return [
+        RoomWithDistance(**room_dict, distance_meters=safe_distance)
+        for (room_dict, _), safe_distance in zip(rows, safe_distances)
+    ]
 
-    if latitude is not None and longitude is not None:
-        if radius is None:
-            radius = DEFAULT_RADIUS_METERS
-        else:
-            radius = min(radius, MAX_RADIUS_METERS)
-        
-        user_point = func.ST_SetSRID(
-            func.ST_MakePoint(longitude, latitude),
-            4326
-        )
-        user_geography = func.ST_GeogFromWKB(func.ST_AsBinary(user_point))
-        
-        distance_expr = func.ST_Distance(
-            RoomModel.public_location,
-            user_geography
-        ).label('distance_meters')
-        
-        geo_filters = [
-            RoomModel.location.isnot(None),
-            RoomModel.public_location.isnot(None),
-            func.ST_DWithin(RoomModel.location, user_geography, radius)
-        ]
 
-        query = (
-            db.query(RoomModel, distance_expr, member_count_subq.c.member_count)
-            .outerjoin(member_count_subq, RoomModel.id == member_count_subq.c.room_id)
-            .filter(*filters, *geo_filters)
-        )
+async def _geo_discovery_page(
+    db: AsyncSession,
+    filters: list,
+    latitude: float,
+    longitude: float,
+    radius: float,
+    nearest: bool,
+    cursor: Optional[str],
+    skip: int,
+    limit: int
+) -> tuple:
+    """
+    One page of list_rooms results ordered by distance.
+    
+    Returns ([(room dict, raw distance)], next cursor key or None).
+    """
+    user_point = func.ST_SetSRID(
+        func.ST_MakePoint(longitude, latitude),
+        4326
+    )
+    user_geography = func.ST_GeogFromWKB(func.ST_AsBinary(user_point))
+    
+    distance = func.ST_Distance(
+        RoomModel.public_location,
+        user_geography
+    )
+    distance_expr = distance.label('distance_meters')
+    
+    geo_filters = [
+        RoomModel.location.isnot(None),
+        RoomModel.public_location.isnot(None),
+    ]
+    
+    if nearest:
+        # KNN: ORDER BY <-> is answered by the spatial index, nearest first,
+        # so only `limit` rows are ever distance-computed
+        knn_distance = RoomModel.public_location.op("<->")(user_geography)
+        rows = (await db.execute(
+            _room_read_query(distance_expr)
+            .where(*filters, *geo_filters)
+            .order_by(knn_distance)
+            .limit(limit)
+        )).all()
+        return [(_room_read_dict(row), row.distance_meters) for row in rows], None
+    
+    geo_filters.append(func.ST_DWithin(RoomModel.location, user_geography, radius))
 
-        if has_seats is True:
-            query = query.filter(
-                (RoomModel.max_players.is_(None)) |
-                (RoomModel.max_players > func.coalesce(member_count_subq.c.member_count, 0))
-            )
+    query = (
+        _room_read_query(distance_expr)
+        .where(*filters, *geo_filters)
+        .order_by(distance, RoomModel.id)
+    )
+    if cursor:
+        after_distance, after_id = _decode_room_cursor(cursor, "geo")
+        query = query.where(tuple_(distance, RoomModel.id) > tuple_(after_distance, after_id))
+    else:
+        query = query.offset(skip)
+    
+    rows = (await db.execute(query.limit(limit))).all()
+    
+    next_cursor_key = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor_key = [last.distance_meters, last[0].id]
+    
+    return [(_room_read_dict(row), row.distance_meters) for row in rows], next_cursor_key
 
-        rows = query.order_by(distance_expr).offset(skip).limit(limit).all()
-        
-        result = []
-        for room, distance, m_count in rows:
-            safe_distance = None
-            if distance is not None:
-                safe_distance = fuzz_distance(clamp_minimum_distance(distance))
-            
-            pub_lat, pub_lon = _extract_public_coords(db, room)
-            room_dict = {
-                **_room_base_dict(room),
-                "public_latitude": pub_lat,
-                "public_longitude": pub_lon,
-                "distance_meters": safe_distance,
-                "member_count": m_count or 0,
-            }
-            result.append(RoomWithDistance(**room_dict))
-        
-        return result
+
+async def _time_discovery_page(
+    db: AsyncSession,
+    filters: list,
+    cursor: Optional[str],
+    skip: int,
+    limit: int
+) -> tuple:
+    """
+    One page of list_rooms results, newest first, when no location is given.
+    
+    Returns ([(room dict, None)], next cursor key or None).
+    """
+    sort_key = func.coalesce(RoomModel.scheduled_at, RoomModel.created_at)
     
+    query = (
+        _room_read_query(sort_key.label('sort_key'))
+        .where(*filters)
+        .order_by(sort_key.desc(), RoomModel.id.desc())
+    )
+    if cursor:
+        after_key, after_id = _decode_room_cursor(cursor, "time")
+        query = query.where(tuple_(sort_key, RoomModel.id) < tuple_(after_key, after_id))
     else:
-        query = (
-            db.query(RoomModel, member_count_subq.c.member_count)
-            .outerjoin(member_count_subq, RoomModel.id == member_count_subq.c.room_id)
-            .filter(*filters)
+        query = query.offset(skip)
+    
+    rows = (await db.execute(query.limit(limit))).all()
+    
+    next_cursor_key = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor_key = [last.sort_key.isoformat(), last[0].id]
+    
+    return [(_room_read_dict(row), None) for row in rows], next_cursor_key
+
+
+@router.get("/viewport", response_model=List[RoomPublic])
+async def list_rooms_in_viewport(
+    response: Response,
+    min_lat: float = Query(..., ge=-90, le=90, description="South edge of the viewport"),
+    min_lon: float = Query(..., ge=-180, le=180, description="West edge of the viewport"),
+    max_lat: float = Query(..., ge=-90, le=90, description="North edge of the viewport"),
+    max_lon: float = Query(..., ge=-180, le=180, description="East edge of the viewport"),
+    game_type: Optional[str] = Query(None, description="Filter by game type (texas_holdem, pot_limit_omaha, etc.)"),
+    game_format: Optional[str] = Query(None, description="Filter by format (cash, tournament)"),
+    buy_in_min: Optional[int] = Query(None, ge=0, description="Minimum buy-in filter"),
+    buy_in_max: Optional[int] = Query(None, ge=0, description="Maximum buy-in filter"),
+    has_seats: Optional[bool] = Query(None, description="Filter rooms with available seats"),
+    limit: int = Query(DEFAULT_VIEWPORT_PINS, ge=1, le=MAX_VIEWPORT_PINS, description="Maximum pins to return"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List active rooms whose public location falls inside a map viewport.
+    
+    Meant for map panning/zooming: a bounding-box `&&` test against the
+    spatial index, with no distance computation or sorting. Supports the same
+    poker filters as list_rooms.
+    
+    At most `limit` pins are returned, soonest/newest first (the same order
+    as time-based discovery). If the viewport holds more rooms, the
+    X-Viewport-Truncated header is set to "true" and the client should zoom
+    in or switch to clustered pins.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must not be greater than max_lat"
         )
+    
+    filters = _discovery_filters(game_type, game_format, buy_in_min, buy_in_max, has_seats)
+    
+    # Same order as time-based discovery, so a crowded viewport always shows
+    # the same pins. Fetch one extra row to detect truncation without a COUNT
+    rows = (await db.execute(
+        _room_read_query()
+        .where(*filters, _viewport_filter(min_lat, min_lon, max_lat, max_lon))
+        .order_by(func.coalesce(RoomModel.scheduled_at, RoomModel.created_at).desc(), RoomModel.id.desc())
+        .limit(limit + 1)
+    )).all()
+    
+    response.headers[VIEWPORT_TRUNCATED_HEADER] = "true" if len(rows) > limit else "false"
+    
+    return [RoomPublic(**_room_read_dict(row)) for row in rows[:limit]]
 
-        if has_seats is True:
-            query = query.filter(
-                (RoomModel.max_players.is_(None)) |
-                (RoomModel.max_players > func.coalesce(member_count_subq.c.member_count, 0))
-            )
 
-        rows = query.offset(skip).limit(limit).all()
+@router.get("/clusters", response_model=List[RoomCluster])
+async def list_room_clusters(
+    response: Response,
+    min_lat: float = Query(..., ge=-90, le=90, description="South edge of the viewport"),
+    min_lon: float = Query(..., ge=-180, le=180, description="West edge of the viewport"),
+    max_lat: float = Query(..., ge=-90, le=90, description="North edge of the viewport"),
+    max_lon: float = Query(..., ge=-180, le=180, description="East edge of the viewport"),
+    zoom: int = Query(..., ge=0, le=MAX_CLUSTER_ZOOM, description="Map zoom level (web-map convention)"),
+    game_type: Optional[str] = Query(None, description="Filter by game type (texas_holdem, pot_limit_omaha, etc.)"),
+    game_format: Optional[str] = Query(None, description="Filter by format (cash, tournament)"),
+    buy_in_min: Optional[int] = Query(None, ge=0, description="Minimum buy-in filter"),
+    buy_in_max: Optional[int] = Query(None, ge=0, description="Maximum buy-in filter"),
+    has_seats: Optional[bool] = Query(None, description="Filter rooms with available seats"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Clustered room pins for zoomed-out map views.
+    
+    The world is divided into a fixed grid whose cells are about 64 screen
+    pixels wide at the given zoom. Every non-empty cell in the viewport comes
+    back as one cluster with its centroid, room count, open-seat count and a
+    game_type breakdown. Nothing is truncated, and the cost grows with the
+    number of cells, not the number of rooms.
+    
+    Cells are cached individually, so overlapping viewports reuse each
+    other's work. Only public/approximate locations are used.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must not be greater than max_lat"
+        )
+    
+    cell = _cluster_cell_degrees(zoom)
+    
+    # A viewport crossing the antimeridian becomes two longitude spans
+    lon_spans = [(min_lon, max_lon)] if min_lon <= max_lon else [(min_lon, 180), (-180, max_lon)]
+    ys = range(math.floor(min_lat / cell), math.floor(max_lat / cell) + 1)
+    x_ranges = [range(math.floor(west / cell), math.floor(east / cell) + 1) for west, east in lon_spans]
+    
+    if sum(len(xs) for xs in x_ranges) * len(ys) > MAX_CLUSTER_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Viewport is too large for this zoom level"
+        )
+    
+    filters = _discovery_filters(game_type, game_format, buy_in_min, buy_in_max, has_seats)
+    filter_key = (game_type, game_format, buy_in_min, buy_in_max, has_seats)
+    missing_marker = object()
+    read_cache, fill_cache = may_read_cache(db.info), may_cache_from(db.info)
+    
+    clusters = []
+    for xs in x_ranges:
+        cells = {
+            (x, y): cluster_cache.get((zoom, x, y, filter_key), missing_marker) if read_cache else missing_marker
+            for x in xs for y in ys
+        }
+        missing = [key for key, value in cells.items() if value is missing_marker]
         
-        result = []
-        for room, m_count in rows:
-            pub_lat, pub_lon = _extract_public_coords(db, room)
-            room_dict = {
-                **_room_base_dict(room),
-                "public_latitude": pub_lat,
-                "public_longitude": pub_lon,
-                "distance_meters": None,
-                "member_count": m_count or 0,
-            }
-            result.append(RoomWithDistance(**room_dict))
+        if missing:
+            # One grouped query over the bounding range of the uncached cells
+            miss_xs = range(min(x for x, _ in missing), max(x for x, _ in missing) + 1)
+            miss_ys = range(min(y for _, y in missing), max(y for _, y in missing) + 1)
+            computed = await _compute_clusters(db, filters, cell, miss_xs, miss_ys)
+            for key in missing:
+                cells[key] = computed.get(key)
+                if fill_cache:
+                    cluster_cache.set((zoom, *key, filter_key), cells[key])
         
-        return result
+        clusters.extend(RoomCluster(**value) for value in cells.values() if value)
+    
+    response.headers["Cache-Control"] = f"public, max-age={CLUSTER_CACHE_TTL_SECONDS}"
+    return clusters
+
+
+# Default MVT buffer (256 of 4096 units): pins near a tile edge are also
+# drawn by the neighbouring tile
+TILE_BUFFER_FRACTION = 0.0625
+
+# Tile envelope (3857) for ST_AsMVTGeom, and the padded search box in 4326
+# from _tile_search_bounds, tested in geometry space like _viewport_filter
+_TILE_BOUNDS_CTE = """
+    WITH search AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+               ST_MakeEnvelope(:west, :south, :east, :north, 4326) AS area
+    )
+"""
+
+
+def _tile_search_bounds(z: int, x: int, y: int) -> dict:
+    """
+    Lon/lat box of a tile padded by the MVT buffer, clamped to the map.
+    
+    Padding past the antimeridian or the Web-Mercator latitude limit is cut
+    off rather than wrapped: pins there would be clipped from this tile anyway.
+    """
+    n = 2 ** z
+    
+    def lon(tile_x: float) -> float:
+        return min(max(tile_x / n * 360 - 180, -180), 180)
+    
+    def lat(tile_y: float) -> float:
+        tile_y = min(max(tile_y, 0), n)
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+    
+    return {
+        "west": lon(x - TILE_BUFFER_FRACTION),
+        "east": lon(x + 1 + TILE_BUFFER_FRACTION),
+        "north": lat(y - TILE_BUFFER_FRACTION),
+        "south": lat(y + 1 + TILE_BUFFER_FRACTION),
+    }
+
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_room_tile(
+    z: int,
+    x: int,
+    y: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Mapbox Vector Tile of active room pins (public locations only).
+    
+    Each feature in the "rooms" layer carries id, game_type, game_format,
+    skill_level and seats_open (null when the room has no player cap).
+    
+    A tile only changes when a room inside it changes, so the ETag is derived
+    from the tile's data version (row count and latest updated_at). Clients
+    revalidate with If-None-Match and get 304 without the tile being rebuilt.
+    """
+    if not (0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tile not found"
+        )
+    
+    params = {"z": z, "x": x, "y": y, **_tile_search_bounds(z, x, y)}
+    
+    # Data version: every room write (including seat counter updates) bumps
+    # updated_at, and inactive rooms are included so removals change it too
+    version = (await db.execute(text(_TILE_BOUNDS_CTE + """
+        SELECT count(rooms.id), max(rooms.updated_at)
+        FROM rooms, search
+        WHERE geometry(rooms.public_location) && search.area
+    """), params)).fetchone()
+    
+    version_key = f"{z}/{x}/{y}:{version[0]}:{version[1].isoformat() if version[1] else ''}"
+    etag = f'"{hashlib.sha1(version_key.encode()).hexdigest()}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    
+    if if_none_match and etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    tile = await db.scalar(text(_TILE_BOUNDS_CTE + """
+        SELECT ST_AsMVT(features, 'rooms', 4096, 'geom')
+        FROM (
+            SELECT rooms.id,
+                   rooms.game_type::text AS game_type,
+                   rooms.game_format::text AS game_format,
+                   rooms.skill_level::text AS skill_level,
+                   CASE WHEN rooms.max_players IS NULL THEN NULL
+                        ELSE GREATEST(rooms.max_players - rooms.active_member_count, 0)
+                   END AS seats_open,
+                   ST_AsMVTGeom(ST_Transform(rooms.public_location::geometry, 3857), search.geom) AS geom
+            FROM rooms, search
+            WHERE rooms.is_active = true
+              AND geometry(rooms.public_location) && search.area
+        ) AS features
+    """), params)
+    
+    return Response(content=bytes(tile or b""), media_type=MVT_MEDIA_TYPE, headers=cache_headers)
 
 
 @router.get("/{room_id}", response_model=RoomPublic)
-async def get_room(room_id: int, db: Session = Depends(get_db)):
+async def get_room(room_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Get room by ID.
     Returns PUBLIC location only (approximate).
     Use /{room_id}/private for exact location (members only).
     """
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    response = await _get_room_read(db, room_id)
     
-    if not room:
+    if not response:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
     
-    pub_lat, pub_lon = _extract_public_coords(db, room)
-    response = {
-        **_room_base_dict(room),
-        "public_latitude": pub_lat,
-        "public_longitude": pub_lon,
-        "member_count": _get_member_count(db, room.id),
-    }
-    
     return RoomPublic(**response)
 
 
 @router.get("/{room_id}/private", response_model=RoomPrivate)
 async def get_room_private(
     room_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get room with EXACT location (members only).
@@ -371,7 +835,7 @@ async def get_room_private(
     All access attempts are logged for security auditing.
     """
     # SECURITY: Verify membership and log the access attempt
-    is_authorized, reason = verify_room_membership(db, current_user.id, room_id)
+    is_authorized, reason = await verify_room_membership(db, current_user.id, room_id)
     
     # Log all access attempts (both granted and denied)
     log_private_location_access(
@@ -399,26 +863,22 @@ async def get_room_private(
                 detail="You must be an approved member to view the exact location"
             )
     
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    location_geom = func.geometry(RoomModel.location)
+    row = (await db.execute(
+        _room_read_query(
+            func.ST_Y(location_geom).label("latitude"),
+            func.ST_X(location_geom).label("longitude"),
+        ).where(RoomModel.id == room_id)
+    )).first()
     
-    pub_lat, pub_lon = _extract_public_coords(db, room)
     response = {
-        **_room_base_dict(room),
-        "latitude": None,
-        "longitude": None,
-        "public_latitude": pub_lat,
-        "public_longitude": pub_lon,
+        **_room_base_dict(row[0]),
+        "latitude": _float_or_none(row.latitude),
+        "longitude": _float_or_none(row.longitude),
+        "public_latitude": _float_or_none(row.public_latitude),
+        "public_longitude": _float_or_none(row.public_longitude),
     }
     
-    if room.location:
-        point_text = db.execute(
-            text("SELECT ST_X(location::geometry), ST_Y(location::geometry) FROM rooms WHERE id = :id"),
-            {"id": room.id},
-        ).fetchone()
-        if point_text:
-            response["longitude"] = float(point_text[0])
-            response["latitude"] = float(point_text[1])
-    
     return RoomPrivate(**response)
 
 
@@ -426,11 +886,16 @@ async def get_room_private(
 async def update_room(
     room_id: int,
     room_update: RoomUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update room (host only)"""
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    """
+    Update room (host only).
+    
+    Raising max_players or turning on auto_promote_waitlist seats waitlisted
+    members straight away when the room auto-promotes.
+    """
+    room = await lock_room(db, room_id)
     
     if not room:
         raise HTTPException(
@@ -473,28 +938,28 @@ async def update_room(
     for field, value in update_data.items():
         setattr(room, field, value)
     
-    db.commit()
-    db.refresh(room)
+    if 'max_players' in update_data or update_data.get('auto_promote_waitlist'):
+        await db.flush()
+        await promote_waitlist_heads(db, room.id)
     
-    pub_lat, pub_lon = _extract_public_coords(db, room)
-    response = {
-        **_room_base_dict(room),
-        "public_latitude": pub_lat,
-        "public_longitude": pub_lon,
-        "member_count": _get_member_count(db, room.id),
-    }
+    if update_data.keys() & {'is_active', 'status', 'max_players'}:
+        await db.flush()
+        await notify_room_status(db, room.id)
     
-    return RoomPublic(**response)
+    await db.commit()
+    invalidate_discovery_cache()
+    
+    return RoomPublic(**await _get_room_read(db, room.id))
 
 
 @router.delete("/{room_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_room(
     room_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete room (host only) - sets room as inactive"""
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     
     if not room:
         raise HTTPException(
@@ -511,74 +976,121 @@ async def delete_room(
     
     # Soft delete - set as inactive
     room.is_active = False
-    db.commit()
+    await db.flush()
+    await notify_room_status(db, room.id)
+    await db.commit()
+    invalidate_discovery_cache()
 
 
-@router.get("/{room_id}/members")
+@router.get("/{room_id}/members", response_model=List[RoomRosterMember])
 async def get_room_members(
     room_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_ROSTER_LIMIT, ge=1, le=MAX_ROSTER_LIMIT),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get room members (host or member only).
-    Returns list of active and waitlisted members.
+    Returns active members (host first) then the waitlist in queue order,
+    each with the member's username, skill level and cached reputation.
+    
+    The access check and the roster page come back from a single joined
+    query; a second query is only needed when the page is empty.
     """
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    roster_statuses = [RoomMemberStatus.ACTIVE, RoomMemberStatus.WAITLISTED]
+    viewer_is_member = select(RoomMemberModel.id).where(
+        RoomMemberModel.room_id == room_id,
+        RoomMemberModel.user_id == current_user.id,
+        RoomMemberModel.status.in_(roster_statuses)
+    ).exists().label("viewer_is_member")
+    
+    rows = (await db.execute(
+        select(
+            RoomModel.host_id,
+            viewer_is_member,
+            RoomMemberModel,
+            User.username,
+            User.skill_level,
+            User.avg_rating,
+            User.review_count,
+            User.games_completed,
+            case(
+                (
+                    RoomMemberModel.status == RoomMemberStatus.WAITLISTED,
+                    func.row_number().over(partition_by=RoomMemberModel.status, order_by=RoomMemberModel.queue_key)
+                ),
+                else_=None
+            ).label("queue_position"),
+        ).select_from(RoomModel).outerjoin(
+            RoomMemberModel,
+            and_(RoomMemberModel.room_id == RoomModel.id, RoomMemberModel.status.in_(roster_statuses))
+        ).outerjoin(
+            User, User.id == RoomMemberModel.user_id
+        ).where(
+            RoomModel.id == room_id
+        ).order_by(
+            RoomMemberModel.is_host.desc(),
+            case((RoomMemberModel.status == RoomMemberStatus.ACTIVE, 0), else_=1),
+            RoomMemberModel.queue_key,
+            RoomMemberModel.joined_at,
+            RoomMemberModel.id
+        ).offset(skip).limit(limit)
+    )).all()
+    
+    if rows:
+        access = rows[0]
+    else:
+        # Past the end of the roster (or no such room) - check access on its own
+        access = (await db.execute(
+            select(RoomModel.host_id, viewer_is_member).where(RoomModel.id == room_id)
+        )).first()
     
-    if not room:
+    if not access:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Room not found"
         )
     
     # Check if user is host or a member
-    is_host = room.host_id == current_user.id
-    is_member = db.query(RoomMemberModel).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.user_id == current_user.id,
-        RoomMemberModel.status.in_([RoomMemberStatus.ACTIVE, RoomMemberStatus.WAITLISTED])
-    ).first() is not None
-    
-    if not is_host and not is_member:
+    if access.host_id != current_user.id and not access.viewer_is_member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only room members can view the member list"
         )
     
-    # Get all active and waitlisted members
-    members = db.query(RoomMemberModel).filter(
-        RoomMemberModel.room_id == room_id,
-        RoomMemberModel.status.in_([RoomMemberStatus.ACTIVE, RoomMemberStatus.WAITLISTED])
-    ).all()
-    
-    # Return member info
-    result = []
-    for member in members:
-        user = db.query(User).filter(User.id == member.user_id).first()
-        result.append({
-            "id": member.id,
-            "user_id": member.user_id,
-            "username": user.username if user else "Unknown",
-            "is_host": member.is_host,
-            "status": member.status.value,
-            "queue_position": member.queue_position,
-            "joined_at": member.joined_at
-        })
-    
-    return result
+    return [
+        RoomRosterMember(
+            id=row.RoomMember.id,
+            user_id=row.RoomMember.user_id,
+            username=row.username,
+            skill_level=row.skill_level,
+            avg_rating=row.avg_rating or 0.0,
+            review_count=row.review_count or 0,
+            games_completed=row.games_completed or 0,
+            is_host=row.RoomMember.is_host,
+            status=row.RoomMember.status,
+            queue_position=row.queue_position,
+            joined_at=row.RoomMember.joined_at
+        )
+        for row in rows
+        if row.RoomMember is not None
+    ]
 
 
 @router.post("/{room_id}/leave")
 async def leave_room(
     room_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Leave a room (member only, not host).
+    
+    A freed seat goes to the head of the waitlist in the same transaction
+    when the room auto-promotes.
     """
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await lock_room(db, room_id)
     
     if not room:
         raise HTTPException(
@@ -594,11 +1106,11 @@ async def leave_room(
         )
     
     # Find user's membership
-    membership = db.query(RoomMemberModel).filter(
+    membership = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.room_id == room_id,
         RoomMemberModel.user_id == current_user.id,
         RoomMemberModel.status.in_([RoomMemberStatus.ACTIVE, RoomMemberStatus.WAITLISTED])
-    ).first()
+    ).with_for_update().execution_options(populate_existing=True))
     
     if not membership:
         raise HTTPException(
@@ -606,24 +1118,21 @@ async def leave_room(
             detail="You are not a member of this room"
         )
     
-    # Update membership status
+    # Update membership status (members behind a waitlisted one move up
+    # automatically, since positions are computed from queue keys)
     old_status = membership.status
-    old_queue_position = membership.queue_position
     membership.status = RoomMemberStatus.LEFT
     membership.left_at = datetime.utcnow()
-    membership.queue_position = None
+    membership.queue_key = None
     
-    # If leaving from waitlist, reorder the queue
-    if old_status == RoomMemberStatus.WAITLISTED and old_queue_position:
-        db.query(RoomMemberModel).filter(
-            RoomMemberModel.room_id == room_id,
-            RoomMemberModel.status == RoomMemberStatus.WAITLISTED,
-            RoomMemberModel.queue_position > old_queue_position
-        ).update({
-            RoomMemberModel.queue_position: RoomMemberModel.queue_position - 1
-        })
-    
-    db.commit()
+    await record_member_transition(db, room_id, old_status, RoomMemberStatus.LEFT)
+    await db.flush()
+    # Auto-promotion sends the new positions itself; otherwise send them if the line moved
+    promoted = await promote_waitlist_heads(db, room_id)
+    if not promoted and old_status == RoomMemberStatus.WAITLISTED:
+        await notify_waitlist_positions(db, room_id)
+    await db.commit()
+    invalidate_discovery_cache()
     
     return {"message": "Successfully left the room"}
 
@@ -632,13 +1141,16 @@ async def leave_room(
 async def kick_member(
     room_id: int,
     member_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kick a member from the room (host only).
+    
+    A freed seat goes to the head of the waitlist in the same transaction
+    when the room auto-promotes.
     """
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await lock_room(db, room_id)
     
     if not room:
         raise HTTPException(
@@ -654,11 +1166,11 @@ async def kick_member(
         )
     
     # Find the membership record
-    membership = db.query(RoomMemberModel).filter(
+    membership = await db.scalar(select(RoomMemberModel).where(
         RoomMemberModel.id == member_id,
         RoomMemberModel.room_id == room_id,
         RoomMemberModel.status.in_([RoomMemberStatus.ACTIVE, RoomMemberStatus.WAITLISTED])
-    ).first()
+    ).with_for_update().execution_options(populate_existing=True))
     
     if not membership:
         raise HTTPException(
@@ -674,25 +1186,23 @@ async def kick_member(
         )
     
     # Update membership status
-    old_queue_position = membership.queue_position
+    old_status = membership.status
     membership.status = RoomMemberStatus.KICKED
     membership.left_at = datetime.utcnow()
-    membership.queue_position = None
-    
-    # If kicking from waitlist, reorder the queue
-    if old_queue_position:
-        db.query(RoomMemberModel).filter(
-            RoomMemberModel.room_id == room_id,
-            RoomMemberModel.status == RoomMemberStatus.WAITLISTED,
-            RoomMemberModel.queue_position > old_queue_position
-        ).update({
-            RoomMemberModel.queue_position: RoomMemberModel.queue_position - 1
-        })
-    
-    db.commit()
+    membership.queue_key = None
+    
+    await record_member_transition(db, room_id, old_status, RoomMemberStatus.KICKED)
+    await db.flush()
+    await notify_memberships(db, room_id, [membership.user_id])
+    # Auto-promotion sends the new positions itself; otherwise send them if the line moved
+    promoted = await promote_waitlist_heads(db, room_id)
+    if not promoted and old_status == RoomMemberStatus.WAITLISTED:
+        await notify_waitlist_positions(db, room_id)
+    await db.commit()
+    invalidate_discovery_cache()
     
     # Get user info for response
-    kicked_user = db.query(User).filter(User.id == membership.user_id).first()
+    kicked_user = await db.scalar(select(User).where(User.id == membership.user_id))
     
     return {"message": f"Successfully kicked {kicked_user.username if kicked_user else 'user'} from the room"}
 
@@ -701,8 +1211,8 @@ async def kick_member(
 async def update_room_status(
     room_id: int,
     status_update: RoomStatusUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update room status (host only).
@@ -715,7 +1225,7 @@ async def update_room_status(
     
     Once FINISHED or CANCELLED, status cannot be changed.
     """
-    room = db.query(RoomModel).filter(RoomModel.id == room_id).first()
+    room = await db.scalar(select(RoomModel).where(RoomModel.id == room_id))
     
     if not room:
         raise HTTPException(
@@ -768,16 +1278,10 @@ async def update_room_status(
     if new_status == RoomStatus.FINISHED:
         room.finished_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(room)
+    await db.flush()
+    await notify_room_status(db, room.id)
+    await db.commit()
+    invalidate_discovery_cache()
     
-    pub_lat, pub_lon = _extract_public_coords(db, room)
-    response = {
-        **_room_base_dict(room),
-        "public_latitude": pub_lat,
-        "public_longitude": pub_lon,
-        "member_count": _get_member_count(db, room.id),
-    }
-    
-    return RoomPublic(**response)
+    return RoomPublic(**await _get_room_read(db, room.id))
 
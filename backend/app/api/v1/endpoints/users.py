@@ -1,25 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.schemas.user import User, UserUpdate
 from app.models.user import User as UserModel
-from app.utils.auth import get_current_user
-from app.utils.security import get_password_hash
+from app.utils.auth import get_current_user_model
+from app.utils.security import get_password_hash_async
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=User)
-async def get_me(current_user: UserModel = Depends(get_current_user)):
+async def get_me(current_user: UserModel = Depends(get_current_user_model)):
     """Get current authenticated user"""
     return current_user
 
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get user by ID"""
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    user = await db.get(UserModel, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,8 +32,8 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
 @router.put("/me", response_model=User)
 async def update_me(
     user_update: UserUpdate,
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserModel = Depends(get_current_user_model),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update current authenticated user"""
     update_data = user_update.model_dump(exclude_unset=True)
@@ -40,10 +41,10 @@ async def update_me(
     if "password" in update_data:
         password = update_data.pop("password")
         if password:
-            current_user.hashed_password = get_password_hash(password)
+            current_user.hashed_password = await get_password_hash_async(password)
 
     if "email" in update_data and update_data["email"] != current_user.email:
-        existing = db.query(UserModel).filter(UserModel.email == update_data["email"]).first()
+        existing = await db.scalar(select(UserModel).where(UserModel.email == update_data["email"]))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -51,7 +52,7 @@ async def update_me(
             )
 
     if "username" in update_data and update_data["username"] != current_user.username:
-        existing = db.query(UserModel).filter(UserModel.username == update_data["username"]).first()
+        existing = await db.scalar(select(UserModel).where(UserModel.username == update_data["username"]))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -61,6 +62,6 @@ async def update_me(
     for field, value in update_data.items():
         setattr(current_user, field, value)
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     return current_user
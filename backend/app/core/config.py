@@ -7,10 +7,32 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 10                 # Connections kept open
+    DB_MAX_OVERFLOW: int = 20              # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT: float = 10            # Seconds to wait for a connection before erroring
+    DB_POOL_RECYCLE: int = 1800            # Replace connections older than this (seconds), -1 to disable
+    DB_POOL_PRE_PING: bool = True          # Test connections on checkout (drops stale ones after failover)
+    DB_STATEMENT_TIMEOUT_MS: int = 15000   # Per-statement timeout, 0 to disable
+    # PgBouncer in transaction pooling mode: no server-side prepared statement
+    # cache and no startup parameters (the statement timeout is set per transaction)
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False
+    
+    # Read replicas - comma-separated URLs, empty to send all reads to the primary
+    DATABASE_REPLICA_URLS: str = ""
+    # After a user writes, their reads stay on the primary for this long (seconds)
+    READ_YOUR_WRITES_SECONDS: float = 10
+    
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # How long an authenticated user's id/username/flags are cached per worker (seconds)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    # Password hashing - changing BCRYPT_ROUNDS rehashes existing passwords on next login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2          # bcrypt threads per worker process
+    PASSWORD_HASH_MAX_PENDING: int = 32     # Running + queued hashes before logins get 503
     
     # OAuth
     GOOGLE_CLIENT_ID: Optional[str] = None  
@@ -20,9 +42,27 @@ class Settings(BaseSettings):
     RATE_LIMIT_LOCATION_REQUESTS_PER_MINUTE: int = 30  # Max location queries per minute
     RATE_LIMIT_PRIVATE_LOCATION_PER_HOUR: int = 100    # Max private location accesses per hour
     
+    # Private location access audit - batched inserts into location_access_audit
+    AUDIT_BATCH_SIZE: int = 500                 # Max rows per INSERT
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0   # Max time an entry waits in the queue
+    AUDIT_QUEUE_MAXSIZE: int = 10000            # Beyond this, entries go to the log instead
+    
+    # Per-user event streams (SSE) fed by Postgres LISTEN/NOTIFY
+    # LISTEN needs a session-level connection: behind PgBouncer in transaction
+    # mode, point this at Postgres directly (empty = DATABASE_URL)
+    EVENTS_DATABASE_URL: str = ""
+    EVENTS_HEARTBEAT_SECONDS: float = 15     # Keep-alive comment interval on idle streams
+    EVENTS_QUEUE_MAXSIZE: int = 100          # Buffered events per stream before it is told to resync
+    
+    # Geocoding - comma-separated backends tried in order ("tiger", "nominatim")
+    GEOCODER_BACKENDS: str = "tiger,nominatim"
+    
     # Environment
     ENVIRONMENT: str = "development"
     
+    # Bearer token for GET /metrics; unset disables the endpoint
+    METRICS_TOKEN: Optional[str] = None
+    
     # CORS - accepts comma-separated string, converts to list
     CORS_ORIGINS: str = "*"
     
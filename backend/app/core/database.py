@@ -1,20 +1,286 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.security import decode_access_token_subject
+
+
+class PoolStats:
+    """
+    Live counters for one connection pool.
+
+    `waiting` is the number of callers currently inside a checkout (either
+    being handed an idle connection or queued for one), and checkout latency
+    is the time spent there, so a growing value means the pool is too small
+    for the load.
+    """
+
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self):
+        self.waiting = 0
+        self.checkouts = 0
+        self.failed = 0
+        self.max_latency_ms = 0.0
+        self._latencies_ms = deque(maxlen=self.LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def checkout_started(self) -> float:
+        with self._lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    def checkout_finished(self, started: float, failed: bool = False) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.waiting -= 1
+            if failed:
+                self.failed += 1
+                return
+            self.checkouts += 1
+            self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+            self._latencies_ms.append(latency_ms)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            samples = sorted(self._latencies_ms)
+            waiting, checkouts, failed = self.waiting, self.checkouts, self.failed
+            max_latency_ms = self.max_latency_ms
+
+        def percentile(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2) if samples else 0.0
+
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "waiting": waiting,
+            "checkouts": checkouts,
+            "failed_checkouts": failed,
+            "checkout_latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(max_latency_ms, 2),
+            },
+        }
+
+
+def _instrumented(pool_class):
+    """Subclass a queue pool so every checkout is timed and counted."""
+
+    class InstrumentedPool(pool_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.stats = PoolStats()
+
+        def _do_get(self):
+            started = self.stats.checkout_started()
+            try:
+                connection = super()._do_get()
+            except Exception:
+                self.stats.checkout_finished(started, failed=True)
+                raise
+            self.stats.checkout_finished(started)
+            return connection
+
+        def recreate(self):
+            # Keep the same counters across pool recreation (e.g. after dispose)
+            new_pool = super().recreate()
+            new_pool.stats = self.stats
+            return new_pool
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _set_statement_timeout_per_transaction(sync_engine) -> None:
+    """PgBouncer rejects startup parameters, so set the timeout when each transaction begins."""
+    @event.listens_for(sync_engine, "begin")
+    def set_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+
+
+def _build_async_engine(database_url: str):
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    connect_args = {}
+
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # Server-side prepared statements don't survive transaction pooling:
+        # disable both caches and give every statement a unique name
+        url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+    engine = create_async_engine(
+        url,
+        poolclass=_instrumented(AsyncAdaptedQueuePool),
+        connect_args=connect_args,
+        **_pool_options(),
+    )
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+        _set_statement_timeout_per_transaction(engine.sync_engine)
+    return engine
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _build_sync_engine():
+    connect_args = {}
+    if not settings.DB_PGBOUNCER_TRANSACTION_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=_instrumented(QueuePool),
+        connect_args=connect_args,
+        **_pool_options(),
+    )
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+        _set_statement_timeout_per_transaction(engine)
+    return engine
+
+
+def _async_sessionmaker(bind):
+    # expire_on_commit=False: objects stay readable after commit without an
+    # implicit (and, under asyncio, illegal) lazy reload
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+# Async engine used by the API (asyncpg) - the primary, for reads and writes
+async_engine = _build_async_engine(settings.DATABASE_URL)
+AsyncSessionLocal = _async_sessionmaker(async_engine)
+
+# Optional read replicas, used round-robin by get_read_db
+replica_engines = [
+    _build_async_engine(url.strip())
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+]
+_replica_sessionmakers = itertools.cycle([_async_sessionmaker(e) for e in replica_engines] or [None])
+
+# Sync engine for code that runs outside the event loop: worker threads
+# (geocoding cache) and command-line maintenance scripts
+engine = _build_sync_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database session"""
-    db = SessionLocal()
-    try:
+def get_pool_stats() -> dict:
+    """Live pool metrics for every engine in this worker."""
+    stats = {
+        "async": async_engine.pool.stats.snapshot(async_engine.pool),
+        "sync": engine.pool.stats.snapshot(engine.pool),
+    }
+    for i, replica in enumerate(replica_engines):
+        stats[f"replica_{i}"] = replica.pool.stats.snapshot(replica.pool)
+    return stats
+
+
+# =============================================================================
+# READ-YOUR-WRITES ROUTING
+# =============================================================================
+#
+# Sessions from get_db remember which user the request came from. When such a
+# session commits a write, the user is recorded in `recent_writers`, and
+# get_read_db keeps that user's reads on the primary until the entry expires,
+# so replica lag never hides their own edits. Anonymous reads and users who
+# haven't written recently go to a replica.
+#
+# The record is per worker process: the window should comfortably exceed
+# replica lag, and deployments with many workers per host benefit from
+# sticky routing by user.
+
+recent_writers = TTLCache(maxsize=100000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _requester_key(request: Request) -> Optional[str]:
+    """User id from the request's bearer token, without touching the database."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token_subject(token)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_writer(session):
+    requester = session.info.get("requester")
+    if session.info.pop("wrote", False) and requester:
+        recent_writers.set(requester, True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_write(session):
+    session.info.pop("wrote", None)
+
+
+async def get_db(request: Request):
+    """Dependency for getting an async database session (primary)"""
+    async with AsyncSessionLocal() as db:
+        db.info["requester"] = _requester_key(request)
         yield db
-    finally:
-        db.close()
 
+
+async def get_read_db(request: Request):
+    """
+    Dependency for read-only endpoints.
+    
+    Yields a replica session, or a primary session when no replicas are
+    configured or the requester wrote within READ_YOUR_WRITES_SECONDS.
+    
+    db.info records the routing for shared caches: "recent_writer" (serve
+    this requester fresh data, not cached answers) and "replica" (results
+    may lag the primary).
+    """
+    requester = _requester_key(request)
+    recent_writer = bool(requester and recent_writers.get(requester))
+    replica_sessionmaker = next(_replica_sessionmakers)
+    
+    if replica_sessionmaker is None or recent_writer:
+        replica_sessionmaker = AsyncSessionLocal
+    
+    async with replica_sessionmaker() as db:
+        db.info["recent_writer"] = recent_writer
+        db.info["replica"] = replica_sessionmaker is not AsyncSessionLocal
+        yield db
@@ -1,18 +1,47 @@
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.database import get_pool_stats
 from app.api.v1.api import api_router
+from app.api.v1.endpoints.rooms import VIEWPORT_TRUNCATED_HEADER
+from app.utils.auth import principal_cache
+from app.utils.discovery_cache import get_discovery_cache_stats
+from app.utils.events import event_broker
+from app.utils.geocoding import get_geocode_cache_stats
+from app.utils.jwks import apple_keys, get_jwks_stats, google_keys
+from app.utils.location_audit import location_audit_sink
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.security import get_password_hash_stats
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the OAuth signing key caches in the background so the first
+    # sign-in doesn't wait on the identity provider
+    if settings.APPLE_CLIENT_ID:
+        apple_keys.prefetch()
+    if settings.GOOGLE_CLIENT_ID:
+        google_keys.prefetch()
+    location_audit_sink.start()
+    event_broker.start()
+    yield
+    await event_broker.stop()
+    await location_audit_sink.stop()
+
 
 app = FastAPI(
     title="PocketPoker API",
     description="Location-based social app for discovering and organizing private poker games",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 limiter = Limiter(key_func=get_remote_address)
@@ -25,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, VIEWPORT_TRUNCATED_HEADER],
 )
 
 # Include API router
@@ -40,3 +70,31 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Only scrapers holding METRICS_TOKEN may read /metrics; without one configured it doesn't exist."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+async def metrics():
+    """Per-worker cache and provider counters (internal: requires METRICS_TOKEN)."""
+    return {
+        "geocoding": get_geocode_cache_stats(),
+        "discovery_cache": get_discovery_cache_stats(),
+        "database_pools": get_pool_stats(),
+        "principal_cache": principal_cache.stats(),
+        "oauth_keys": get_jwks_stats(),
+        "password_hashing": get_password_hash_stats(),
+        "location_audit": location_audit_sink.stats(),
+        "event_streams": event_broker.stats(),
+    }
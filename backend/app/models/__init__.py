@@ -5,6 +5,8 @@ from app.models.host_subscription import HostSubscription, SubscriptionStatus, S
 from app.models.room_member import RoomMember, RoomMemberStatus
 from app.models.review import Review
 from app.models.enums import SkillLevel
+from app.models.geocode_cache import GeocodeCache
+from app.models.location_access_audit import LocationAccessAudit
 
-__all__ = ["User", "Room", "RoomStatus", "JoinRequest", "HostSubscription", "SubscriptionStatus", "SubscriptionTier", "RoomMember", "RoomMemberStatus", "Review", "SkillLevel"]
+__all__ = ["User", "Room", "RoomStatus", "JoinRequest", "HostSubscription", "SubscriptionStatus", "SubscriptionTier", "RoomMember", "RoomMemberStatus", "Review", "SkillLevel", "GeocodeCache", "LocationAccessAudit"]
 
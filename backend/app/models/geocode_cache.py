@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Float, DateTime
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class GeocodeCache(Base):
+    """
+    Persistent cache of geocoding results, keyed by normalized address.
+
+    A row with null coordinates is a cached "not found" result; those are
+    stored with a shorter expiry than successful lookups.
+    """
+    __tablename__ = "geocode_cache"
+
+    query_key = Column(String, primary_key=True)  # Normalized address string
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
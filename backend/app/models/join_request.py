@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -28,3 +28,8 @@ class JoinRequest(Base):
     user = relationship("User", back_populates="join_requests", foreign_keys=[user_id])
     room = relationship("Room", back_populates="join_requests", foreign_keys=[room_id])
 
+    __table_args__ = (
+        # Host inbox: a room's requests in one status, oldest first
+        Index("ix_join_requests_room_status_created", "room_id", "status", "created_at"),
+    )
+
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, DateTime, Identity, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class LocationAccessAudit(Base):
+    """
+    Audit trail of attempts to read a room's exact location.
+
+    Range-partitioned by month on accessed_at (one child table per month,
+    created on demand by the audit sink), so old months can be detached or
+    dropped without touching current data. No foreign keys: audit rows must
+    outlive the users and rooms they mention.
+    """
+    __tablename__ = "location_access_audit"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    # Partition key, so it has to be part of the primary key
+    accessed_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    user_id = Column(Integer, nullable=False)
+    room_id = Column(Integer, nullable=False)
+    access_granted = Column(Boolean, nullable=False)
+    reason = Column(String, nullable=True)
+
+    __table_args__ = (
+        # "Who accessed room X" / "what did user Y access", newest first
+        Index("ix_location_access_audit_room_time", "room_id", "accessed_at"),
+        Index("ix_location_access_audit_user_time", "user_id", "accessed_at"),
+        {"postgresql_partition_by": "RANGE (accessed_at)"},
+    )
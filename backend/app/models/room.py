@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Computed, Index, func, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
 from datetime import datetime
@@ -56,6 +56,18 @@ class Room(Base):
     buy_in_min = Column(Integer, nullable=True)   # Structured min buy-in for filtering
     buy_in_max = Column(Integer, nullable=True)   # Structured max buy-in for filtering
     max_players = Column(Integer, nullable=True)
+    # Fill freed seats from the head of the waitlist automatically (app/utils/waitlist.py)
+    auto_promote_waitlist = Column(Boolean, default=False, server_default="false", nullable=False)
+    
+    # Denormalized seat counters - kept in sync by every membership write path
+    # (see app/utils/room_counters.py), recomputable from room_members
+    active_member_count = Column(Integer, default=0, server_default="0", nullable=False)
+    waitlist_count = Column(Integer, default=0, server_default="0", nullable=False)
+    has_open_seats = Column(
+        Boolean,
+        Computed("max_players IS NULL OR active_member_count < max_players", persisted=True),
+        index=True
+    )
 
     game_type = Column(
         SQLEnum(GameType, values_callable=lambda x: [e.value for e in x]),
@@ -83,3 +95,18 @@ class Room(Base):
     members = relationship("RoomMember", back_populates="room", foreign_keys="RoomMember.room_id")
     reviews = relationship("Review", back_populates="room", foreign_keys="Review.room_id")
 
+    __table_args__ = (
+        # Keyset order for non-geo discovery: (scheduled_at or created_at, id), newest first
+        Index(
+            'ix_rooms_discovery_order',
+            func.coalesce(scheduled_at, created_at).desc(),
+            id.desc(),
+            postgresql_where=(is_active == True)
+        ),
+        # Planar lon/lat box tests for map viewports and tiles (see _viewport_filter)
+        Index(
+            'ix_rooms_public_location_geom',
+            func.geometry(public_location),
+            postgresql_using='gist'
+        ),
+    )
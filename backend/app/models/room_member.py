@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Boolean, Index, Sequence, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -14,6 +14,11 @@ class RoomMemberStatus(str, enum.Enum):
     WAITLISTED = "waitlisted"
 
 
+# Source of waitlist order keys; only ever increases, so a later join always
+# sorts after every earlier one without renumbering anyone
+queue_key_seq = Sequence("room_members_queue_key_seq", metadata=Base.metadata)
+
+
 class RoomMember(Base):
     __tablename__ = "room_members"
 
@@ -28,8 +33,10 @@ class RoomMember(Base):
         nullable=False
     )
     
-    # Queue position for waitlisted members (1 = first in line, null = not waitlisted)
-    queue_position = Column(Integer, nullable=True, index=True)
+    # Waitlist order key (null = not waitlisted). Keys have gaps; the displayed
+    # queue position is computed at read time by counting lower keys, so
+    # leaving the waitlist only ever touches the leaving member's row.
+    queue_key = Column(BigInteger, nullable=True)
     
     joined_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     left_at = Column(DateTime, nullable=True)
@@ -43,4 +50,11 @@ class RoomMember(Base):
     # Ensure a user can only be a member of a room once
     __table_args__ = (
         UniqueConstraint('user_id', 'room_id', name='uq_room_member_user_room'),
+        # Waitlist order and position counts for one room
+        Index(
+            'ix_room_members_waitlist_order',
+            'room_id',
+            'queue_key',
+            postgresql_where=(status == RoomMemberStatus.WAITLISTED)
+        ),
     )
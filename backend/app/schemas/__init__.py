@@ -1,5 +1,5 @@
 from app.schemas.user import User, UserCreate, UserUpdate, SkillLevel
-from app.schemas.room import Room, RoomCreate, RoomUpdate, RoomWithDistance, RoomPublic, RoomPrivate, RoomStatus, RoomStatusUpdate, SkillLevel as RoomSkillLevel
+from app.schemas.room import Room, RoomCreate, RoomUpdate, RoomWithDistance, RoomPublic, RoomPrivate, RoomCluster, RoomStatus, RoomStatusUpdate, SkillLevel as RoomSkillLevel
 from app.schemas.join_request import JoinRequest, JoinRequestCreate, JoinRequestUpdate
 from app.schemas.host_subscription import (
     HostSubscription,
@@ -32,6 +32,7 @@ __all__ = [
     "RoomWithDistance",
     "RoomPublic",
     "RoomPrivate",
+    "RoomCluster",
     "RoomStatus",
     "RoomStatusUpdate",
     "JoinRequest",
@@ -1,7 +1,9 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from pydantic import Field
 from app.models.join_request import JoinRequestStatus
+from app.schemas.user import SkillLevel
 
 
 class JoinRequestBase(BaseModel):
@@ -28,3 +30,29 @@ class JoinRequest(JoinRequestBase):
     class Config:
         from_attributes = True
 
+
+
+class JoinRequestInboxItem(JoinRequest):
+    """Pending join request with the requester's public profile and cached reputation"""
+    username: str
+    skill_level: Optional[SkillLevel] = None
+    avg_rating: float = 0.0
+    review_count: int = 0
+    games_completed: int = 0
+
+
+class JoinRequestBulkDecide(BaseModel):
+    """Approve and/or reject many pending requests for one room at once"""
+    room_id: int
+    # Approved requesters fill open seats oldest request first, then join the waitlist
+    approve: List[int] = Field(default_factory=list, max_length=500)
+    reject: List[int] = Field(default_factory=list, max_length=500)
+
+
+class JoinRequestBulkDecideResult(BaseModel):
+    """Request ids by outcome"""
+    room_id: int
+    activated: List[int]    # Approved and seated
+    waitlisted: List[int]   # Approved onto the waitlist (room full)
+    rejected: List[int]
+    skipped: List[int]      # Not found, not pending, or not for this room
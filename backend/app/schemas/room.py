@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from decimal import Decimal
 from enum import Enum
 
@@ -45,6 +45,7 @@ class RoomBase(BaseModel):
     buy_in_min: Optional[int] = None
     buy_in_max: Optional[int] = None
     max_players: Optional[int] = None
+    auto_promote_waitlist: bool = False
     skill_level: Optional[SkillLevel] = None
     scheduled_at: Optional[datetime] = None
     game_type: Optional[GameType] = None
@@ -83,6 +84,8 @@ class RoomUpdate(BaseModel):
     buy_in_min: Optional[int] = None
     buy_in_max: Optional[int] = None
     max_players: Optional[int] = None
+    # Not Optional: the column is NOT NULL, so an explicit null is rejected (omit the field to leave it unchanged)
+    auto_promote_waitlist: bool = False
     skill_level: Optional[SkillLevel] = None
     scheduled_at: Optional[datetime] = None
     game_type: Optional[GameType] = None
@@ -122,7 +125,10 @@ class RoomPublic(BaseModel):
     buy_in_min: Optional[int] = None
     buy_in_max: Optional[int] = None
     max_players: Optional[int] = None
+    auto_promote_waitlist: bool = False
     member_count: Optional[int] = None
+    waitlist_count: Optional[int] = None
+    has_open_seats: Optional[bool] = None
     skill_level: Optional[SkillLevel] = None
     game_type: Optional[GameType] = None
     game_format: Optional[GameFormat] = None
@@ -165,6 +171,18 @@ class RoomPrivate(Room):
         from_attributes = True
 
 
+class RoomCluster(BaseModel):
+    """
+    Rooms aggregated into one map grid cell.
+    Built from public/approximate locations only.
+    """
+    latitude: float
+    longitude: float
+    room_count: int
+    open_seat_count: int
+    game_types: Dict[str, int] = {}
+
+
 class RoomStatusUpdate(BaseModel):
     """Schema for updating room status (host only)"""
     status: RoomStatus
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
-from app.schemas.user import User
+from app.schemas.user import User, SkillLevel
 from app.models.room_member import RoomMemberStatus
 
 
@@ -41,3 +41,18 @@ class RoomMemberWithUser(RoomMember):
 
     class Config:
         from_attributes = True
+
+
+class RoomRosterMember(BaseModel):
+    """One roster entry: membership plus the member's public profile and cached reputation"""
+    id: int
+    user_id: int
+    username: str
+    skill_level: Optional[SkillLevel] = None
+    avg_rating: float = 0.0
+    review_count: int = 0
+    games_completed: int = 0
+    is_host: bool
+    status: RoomMemberStatus
+    queue_position: Optional[int] = None
+    joined_at: datetime
@@ -1,30 +1,117 @@
 """
 Authentication utilities for FastAPI dependencies.
+
+`get_current_user` returns a small, immutable `Principal` rather than the
+ORM row. Principals are cached per worker for PRINCIPAL_CACHE_TTL_SECONDS,
+so an authenticated request normally costs no database round trip. Any
+committed change to a user's username, isHost or is_active flag drops that
+user's entry in the committing worker (other workers pick it up when the
+entry expires).
 """
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user, as much of it as authorization checks need."""
+    id: int
+    username: str
+    is_active: bool
+    isHost: bool
+
+
+# user id -> Principal, or None for ids with no user row
+principal_cache = TTLCache(maxsize=10000, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+_MISSING = object()
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a cached principal (call after committing a change to the user)."""
+    principal_cache.pop(user_id)
+
+
+@event.listens_for(User.username, "set")
+@event.listens_for(User.isHost, "set")
+@event.listens_for(User.is_active, "set")
+def _mark_principal_stale(target, value, oldvalue, initiator):
+    if target.id is not None:
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault("stale_principals", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_stale_principals(session):
+    for user_id in session.info.pop("stale_principals", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_stale_principals(session):
+    session.info.pop("stale_principals", None)
+
+
+def _token_user_id(token: str) -> Optional[int]:
+    """User id from a valid access token, or None."""
+    try:
+        payload = jwt.decode(
+            token, 
+            settings.SECRET_KEY, 
+            algorithms=[settings.ALGORITHM]
+        )
+        user_id = payload.get("sub")
+        return int(user_id) if user_id is not None else None
+    except (JWTError, ValueError):
+        return None
+
+
+async def _get_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Cached principal for a user id, loading it on a miss."""
+    principal = principal_cache.get(user_id, _MISSING)
+    if principal is _MISSING:
+        user = await db.get(User, user_id)
+        principal = Principal(
+            id=user.id,
+            username=user.username,
+            is_active=bool(user.is_active),
+            isHost=bool(user.isHost),
+        ) if user else None
+        principal_cache.set(user_id, principal)
+    return principal
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
     Dependency to get the current authenticated user from JWT token.
     
     Usage:
         @router.get("/protected")
-        async def protected_route(current_user: User = Depends(get_current_user)):
+        async def protected_route(current_user: Principal = Depends(get_current_user)):
             return {"user_id": current_user.id}
+    
+    Endpoints that need the full user row should use get_current_user_model.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,40 +119,51 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    user_id = _token_user_id(credentials.credentials)
+    if user_id is None:
+        logger.debug("Rejected access token: invalid or missing subject")
         raise credentials_exception
     
-    # Get user from database
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    print(f"DEBUG auth: user_id from token={user_id}, user found={user is not None}")
-    if user is None:
+    principal = await _get_principal(db, user_id)
+    if principal is None:
+        logger.info(f"Rejected access token for unknown user {user_id}")
         raise credentials_exception
     
-    if not user.is_active:
-        print(f"DEBUG auth: User {user.id} ({user.username}) is_active=False, returning 403")
+    if not principal.is_active:
+        logger.info(f"Rejected access token for disabled user {principal.id} ({principal.username})")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled"
         )
     
-    print(f"DEBUG auth: Authenticated as user {user.id} ({user.username})")
+    logger.debug(f"Authenticated as user {principal.id} ({principal.username})")
+    return principal
+
+
+async def get_current_user_model(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Dependency for endpoints that read or modify the full user row.
+    
+    Costs one primary-key lookup on top of get_current_user.
+    """
+    user = await db.get(User, current_user.id)
+    if user is None:
+        invalidate_principal(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
 async def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> User | None:
+    db: AsyncSession = Depends(get_db)
+) -> Principal | None:
     """
     Optional authentication - returns user if token is valid, None otherwise.
     Useful for endpoints that work for both authenticated and anonymous users.
@@ -73,20 +171,11 @@ async def get_current_user_optional(
     if credentials is None:
         return None
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        
-        user = db.query(User).filter(User.id == int(user_id)).first()
-        if user and user.is_active:
-            return user
-        return None
-    except JWTError:
+    user_id = _token_user_id(credentials.credentials)
+    if user_id is None:
         return None
+    
+    principal = await _get_principal(db, user_id)
+    if principal and principal.is_active:
+        return principal
+    return None
@@ -0,0 +1,91 @@
+"""
+In-process caches for the anonymous room discovery endpoints.
+
+Discovery answers only change when rooms or memberships change, so every
+write path that touches either calls `invalidate_discovery_cache()` after
+committing. Caches are per worker: another worker's write is only picked up
+when the entry expires, which bounds staleness to the TTL.
+
+Answers read from a replica may predate a write the primary already has, so
+for READ_YOUR_WRITES_SECONDS after an invalidation they are not cached (see
+`may_cache_from`), and requesters who just wrote bypass the cache entirely.
+
+Cached discovery rows hold raw (pre-fuzz) distances. Fuzzing and clamping
+are applied each time a response is served, never before caching.
+"""
+import math
+import time
+from typing import Tuple
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+DISCOVERY_CACHE_TTL_SECONDS = 30
+CLUSTER_CACHE_TTL_SECONDS = 30
+
+# Query origins are snapped to this grid (~550m north-south) so nearby users
+# share entries, and radii are rounded up to this step
+DISCOVERY_GRID_DEGREES = 0.005
+DISCOVERY_RADIUS_STEP_METERS = 100
+
+# list_rooms first pages: (mode, origin, radius, filters, skip, limit) -> (rows, next cursor key)
+discovery_cache = TTLCache(maxsize=10000, ttl=DISCOVERY_CACHE_TTL_SECONDS)
+
+# Per-cell cluster cache: (zoom, cell_x, cell_y, filters) -> cluster dict, or None for empty cells
+cluster_cache = TTLCache(maxsize=50000, ttl=CLUSTER_CACHE_TTL_SECONDS)
+
+# When this worker last dropped its caches (monotonic clock)
+_last_invalidated = 0.0
+
+
+def quantize_origin(latitude: float, longitude: float) -> Tuple[float, float]:
+    """
+    Snap a query origin to the centre of its grid cell.
+
+    The top edge (latitude 90, longitude 180) belongs to the last cell, so
+    snapped origins always stay within valid coordinates.
+    """
+    def snap(value: float, limit: float) -> float:
+        last_cell = round(limit / DISCOVERY_GRID_DEGREES) - 1
+        index = min(math.floor(value / DISCOVERY_GRID_DEGREES), last_cell)
+        return round((index + 0.5) * DISCOVERY_GRID_DEGREES, 6)
+
+    return snap(latitude, 90), snap(longitude, 180)
+
+
+def quantize_radius(radius: float) -> float:
+    """Round a search radius up to the next step."""
+    return math.ceil(radius / DISCOVERY_RADIUS_STEP_METERS) * DISCOVERY_RADIUS_STEP_METERS
+
+
+def invalidate_discovery_cache() -> None:
+    """Drop every cached discovery answer in this worker (call after committing a room or membership change)."""
+    global _last_invalidated
+    _last_invalidated = time.monotonic()
+    discovery_cache.clear()
+    cluster_cache.clear()
+
+
+def may_read_cache(session_info: dict) -> bool:
+    """Whether a request may be answered from the caches (not for requesters who just wrote)."""
+    return not session_info.get("recent_writer")
+
+
+def may_cache_from(session_info: dict) -> bool:
+    """
+    Whether an answer computed on this session may be cached for everyone.
+    
+    Primary answers always may. Replica answers may not until replicas have
+    had READ_YOUR_WRITES_SECONDS to catch up with the write that last
+    invalidated the caches, so a lagging replica can't put a stale page back.
+    """
+    if not session_info.get("replica"):
+        return True
+    return time.monotonic() - _last_invalidated >= settings.READ_YOUR_WRITES_SECONDS
+
+
+def get_discovery_cache_stats() -> dict:
+    return {
+        "discovery": discovery_cache.stats(),
+        "clusters": cluster_cache.stats(),
+    }
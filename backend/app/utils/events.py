@@ -0,0 +1,254 @@
+"""
+Per-user event stream: join request, waitlist and room status changes.
+
+Write paths publish events with the helpers below *before* committing. They
+are Postgres NOTIFYs on EVENTS_CHANNEL, so they are delivered only if the
+transaction commits, and every API worker sees every event. Each helper is a
+single statement that builds the payloads from the rows as the transaction
+sees them, however many users are notified.
+
+Each worker holds one LISTEN connection (`event_broker`, started from the
+app lifespan) and hands events to the SSE streams of the users connected to
+that worker (app/api/v1/endpoints/events.py). A stream that falls more than
+EVENTS_QUEUE_MAXSIZE events behind gets a single `resync` event instead,
+telling the client to refetch its state.
+
+Payloads are JSON objects: {"user_id": ..., "event": ..., "data": {...}}.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "user_events"
+RECONNECT_DELAY_SECONDS = 5
+
+RESYNC_EVENT = {"event": "resync", "data": {}}
+
+
+# =============================================================================
+# PUBLISHING (inside the writing transaction)
+# =============================================================================
+
+async def notify_join_requests(db: AsyncSession, request_ids: Iterable[int]) -> None:
+    """Send each requester the current status of their join request."""
+    request_ids = list(request_ids)
+    if not request_ids:
+        return
+    # join_requests.status stores enum names; the API reports the lowercase values
+    await db.execute(text("""
+        SELECT pg_notify(:channel, json_build_object(
+            'user_id', user_id,
+            'event', 'join_request',
+            'data', json_build_object('id', id, 'room_id', room_id, 'status', lower(status::text))
+        )::text)
+        FROM join_requests
+        WHERE id = ANY(:request_ids)
+    """), {"channel": EVENTS_CHANNEL, "request_ids": request_ids})
+
+
+async def notify_memberships(db: AsyncSession, room_id: int, user_ids: Iterable[int]) -> None:
+    """
+    Send members of a room their current membership status (seated,
+    waitlisted, kicked...), with their queue position if waitlisted.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    await db.execute(text("""
+        SELECT pg_notify(:channel, json_build_object(
+            'user_id', m.user_id,
+            'event', 'membership',
+            'data', json_build_object(
+                'room_id', m.room_id,
+                'status', m.status,
+                'queue_position', CASE WHEN m.status = 'waitlisted' THEN (
+                    SELECT count(*) FROM room_members w
+                    WHERE w.room_id = m.room_id AND w.status = 'waitlisted' AND w.queue_key <= m.queue_key
+                ) END
+            )
+        )::text)
+        FROM room_members m
+        WHERE m.room_id = :room_id AND m.user_id = ANY(:user_ids)
+    """), {"channel": EVENTS_CHANNEL, "room_id": room_id, "user_ids": user_ids})
+
+
+async def notify_waitlist_positions(db: AsyncSession, room_id: int) -> None:
+    """
+    Send everyone on a room's waitlist their position (call when members
+    leave the waitlist; joining the end of it doesn't move anyone).
+    """
+    await db.execute(text("""
+        SELECT pg_notify(:channel, json_build_object(
+            'user_id', user_id,
+            'event', 'waitlist_position',
+            'data', json_build_object(
+                'room_id', room_id,
+                'queue_position', row_number() OVER (ORDER BY queue_key),
+                'total_in_queue', count(*) OVER ()
+            )
+        )::text)
+        FROM room_members
+        WHERE room_id = :room_id AND status = 'waitlisted'
+    """), {"channel": EVENTS_CHANNEL, "room_id": room_id})
+
+
+async def notify_room_status(db: AsyncSession, room_id: int) -> None:
+    """
+    Send a room's status to everyone waiting on it: the host, seated and
+    waitlisted members, and users with a pending join request.
+    """
+    await db.execute(text("""
+        SELECT pg_notify(:channel, json_build_object(
+            'user_id', audience.user_id,
+            'event', 'room_status',
+            'data', json_build_object(
+                'room_id', r.id,
+                'status', r.status,
+                'is_active', r.is_active,
+                'max_players', r.max_players,
+                'active_member_count', r.active_member_count,
+                'has_open_seats', r.has_open_seats
+            )
+        )::text)
+        FROM rooms r,
+             (SELECT user_id FROM room_members
+              WHERE room_id = :room_id AND status IN ('active', 'waitlisted')
+              UNION
+              SELECT user_id FROM join_requests
+              WHERE room_id = :room_id AND status = 'PENDING') AS audience
+        WHERE r.id = :room_id
+    """), {"channel": EVENTS_CHANNEL, "room_id": room_id})
+
+
+# =============================================================================
+# DELIVERY (one LISTEN connection per worker)
+# =============================================================================
+
+def _listen_dsn() -> str:
+    """Plain libpq URL for asyncpg (LISTEN needs a direct connection, not PgBouncer in transaction mode)."""
+    url = make_url(settings.EVENTS_DATABASE_URL or settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class EventBroker:
+    """Fans NOTIFY payloads out to the streams of connected users."""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.received = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self.reconnects = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Queue of events for one stream of user_id, for as long as the context is open."""
+        queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_MAXSIZE)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def _resync_all(self) -> None:
+        # Events may have been missed while the connection was down
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._deliver(queue, RESYNC_EVENT)
+
+    def _deliver(self, queue: asyncio.Queue, event: dict) -> None:
+        try:
+            queue.put_nowait(event)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # The client is too far behind: drop the backlog and have it refetch
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_EVENT)
+            self.resyncs += 1
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.received += 1
+        try:
+            message = json.loads(payload)
+            queues = self._subscribers.get(message["user_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed event payload: {payload[:200]}")
+            return
+        if not queues:
+            return
+        event = {"event": message["event"], "data": message.get("data", {})}
+        for queue in list(queues):
+            self._deliver(queue, event)
+
+    async def _run(self) -> None:
+        first_attempt = True
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_listen_dsn())
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(EVENTS_CHANNEL, self._on_notify)
+                self.connected = True
+                if not first_attempt:
+                    self._resync_all()
+                await lost.wait()
+                logger.warning("Event stream LISTEN connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event stream LISTEN connection failed: {e}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            first_attempt = False
+            self.reconnects += 1
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+            "received": self.received,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "reconnects": self.reconnects,
+        }
+
+
+event_broker = EventBroker()
@@ -1,28 +1,416 @@
 """
 Geocoding utility for converting addresses to coordinates.
-Uses OpenStreetMap's Nominatim service (free, no API key required).
+
+Lookups run through a chain of backends (settings.GEOCODER_BACKENDS):
+- "tiger": the PostGIS tiger geocoder tables in our own database
+  (zip codes, "City, ST" and street addresses), no network round trip
+- "nominatim": OpenStreetMap's Nominatim service (free, no API key required),
+  used as the fallback for anything the local data can't resolve
+
+Lookups go through a two-tier cache keyed by the normalized address:
+1. In-process LRU (per worker)
+2. Persistent `geocode_cache` table (shared by all workers)
+
+"Not found" results are cached too, with a shorter TTL. Backend errors
+(timeouts, service errors, missing tiger data) are never cached.
+
+Async callers should use `geocode_address_async`, which keeps provider calls
+off the event loop, coalesces identical in-flight lookups, and fails fast
+with `GeocodingUnavailableError` while the Nominatim circuit is open.
 """
-from typing import Optional, Tuple
+import asyncio
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from sqlalchemy.orm import Session
 import logging
 
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.geocode_cache import GeocodeCache
+from app.utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 # Initialize geocoder with a user agent (required by Nominatim)
 geolocator = Nominatim(user_agent="pocketpoker_app", timeout=10)
 
+# Cache lifetimes
+GEOCODE_CACHE_TTL = timedelta(days=30)          # Successful lookups
+GEOCODE_NEGATIVE_CACHE_TTL = timedelta(days=1)  # "Not found" results
+GEOCODE_MEMORY_CACHE_SIZE = 10000
+
+_memory_cache = TTLCache(maxsize=GEOCODE_MEMORY_CACHE_SIZE, ttl=GEOCODE_CACHE_TTL.total_seconds())
+_NOT_CACHED = object()
+
+# Persistent-tier counters (memory-tier counters live on the cache)
+_stats = Counter()
+
+# Per-backend counters: {backend name: Counter(calls, hits, errors, rejected)}
+_backend_stats: Dict[str, Counter] = {}
+
+# Counters are bumped from the geocode worker threads and the event loop;
+# Counter `+=` is a read-modify-write, so every update holds this lock
+_stats_lock = threading.Lock()
+
+
+def _count(counter: Counter, key: str) -> None:
+    with _stats_lock:
+        counter[key] += 1
+
+# Backend calls block for up to the geocoder timeout, so they run on a small
+# dedicated pool instead of the event loop (Nominatim allows ~1 req/s anyway)
+GEOCODE_MAX_WORKERS = 4
+_executor = ThreadPoolExecutor(max_workers=GEOCODE_MAX_WORKERS, thread_name_prefix="geocode")
+
+# Lookups currently running on the pool, keyed by normalized address
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+class GeocodingUnavailableError(Exception):
+    """Raised when a geocoding backend is skipped because its circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls go through; `failure_threshold` failures in a row open it
+    open      -> calls are rejected until `reset_timeout` seconds have passed
+    half-open -> one trial call is let through; success closes the circuit,
+                 failure re-opens it
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_progress:
+                return False
+            self._trial_in_progress = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_progress = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+provider_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address into a cache key.
+
+    Case, punctuation and whitespace differences are ignored, so
+    "San Francisco, CA" and "san francisco ca" share one entry.
+    """
+    without_punctuation = re.sub(r"[^\w\s]", " ", address.lower())
+    return " ".join(without_punctuation.split())
+
+
+def get_geocode_cache_stats() -> dict:
+    """Hit/miss counters for both cache tiers and each backend."""
+    with _stats_lock:
+        stats = dict(_stats)
+        backends = {name: dict(counts) for name, counts in _backend_stats.items()}
+    return {
+        "memory": _memory_cache.stats(),
+        "database_hits": stats.get("database_hits", 0),
+        "database_misses": stats.get("database_misses", 0),
+        "negative_hits": stats.get("negative_hits", 0),
+        "coalesced": stats.get("coalesced", 0),
+        "inflight": len(_inflight),
+        "backends": backends,
+        "circuit": provider_breaker.state,
+    }
+
+
+def _cache_ttl(coords: Optional[Tuple[float, float]]) -> timedelta:
+    return GEOCODE_CACHE_TTL if coords else GEOCODE_NEGATIVE_CACHE_TTL
+
+
+def _read_persistent_cache(db: Session, key: str):
+    """Return cached coords (or None for a cached miss), or _NOT_CACHED."""
+    entry = db.get(GeocodeCache, key)
+    if entry is None or entry.expires_at <= datetime.utcnow():
+        _count(_stats, "database_misses")
+        return _NOT_CACHED
+
+    _count(_stats, "database_hits")
+    coords = (entry.latitude, entry.longitude) if entry.latitude is not None else None
+
+    # Promote to the memory tier for the rest of the entry's lifetime
+    remaining = (entry.expires_at - datetime.utcnow()).total_seconds()
+    _memory_cache.set(key, coords, ttl=remaining)
+    return coords
+
+
+def _write_persistent_cache(db: Session, key: str, coords: Optional[Tuple[float, float]]) -> None:
+    """Upsert a cache row; failures are logged and never fail the lookup."""
+    now = datetime.utcnow()
+    try:
+        db.merge(GeocodeCache(
+            query_key=key,
+            latitude=coords[0] if coords else None,
+            longitude=coords[1] if coords else None,
+            created_at=now,
+            expires_at=now + _cache_ttl(coords),
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not persist geocode cache entry for '{key}': {e}")
+
+
+class GeocoderBackend:
+    """
+    A single geocoding source.
+
+    `geocode` returns coordinates, or None when the source has no match.
+    It raises on errors, so the chain can tell "not found" (cacheable) from
+    "couldn't ask" (not cacheable).
+    """
+    name = "base"
+
+    def geocode(self, address: str, db: Optional[Session]) -> Optional[Tuple[float, float]]:
+        raise NotImplementedError
+
+
+class TigerGeocoder(GeocoderBackend):
+    """
+    Local geocoder over the PostGIS tiger tables (US only).
+
+    - 5-digit zip codes resolve to a point inside the ZCTA polygon
+    - "City, ST" resolves to a point inside the census place
+    - Anything else goes through the tiger `geocode()` function, and only
+      matches rated `TIGER_MAX_RATING` or better (0 = exact) are accepted
+
+    Tiger geometries are NAD83 (SRID 4269) and are transformed to WGS84.
+    """
+    name = "tiger"
+
+    TIGER_MAX_RATING = 20
+
+    _ZIP_PATTERN = re.compile(r"^\s*(\d{5})(?:-\d{4})?\s*$")
+    _CITY_STATE_PATTERN = re.compile(r"^\s*([^,\d]+?)\s*,\s*([A-Za-z]{2})\s*$")
+
+    _ZIP_SQL = text("""
+        SELECT ST_Y(pt), ST_X(pt) FROM (
+            SELECT ST_Transform(ST_PointOnSurface(the_geom), 4326) AS pt
+            FROM zcta5
+            WHERE zcta5ce = :zip
+            LIMIT 1
+        ) z
+    """)
+    _PLACE_SQL = text("""
+        SELECT ST_Y(pt), ST_X(pt) FROM (
+            SELECT ST_Transform(ST_PointOnSurface(p.the_geom), 4326) AS pt
+            FROM place p
+            JOIN state s ON s.statefp = p.statefp
+            WHERE s.stusps = :state AND lower(p.name) = :city
+            ORDER BY p.aland DESC NULLS LAST
+            LIMIT 1
+        ) pl
+    """)
+    _ADDRESS_SQL = text("""
+        SELECT ST_Y(pt), ST_X(pt) FROM (
+            SELECT ST_Transform(geomout, 4326) AS pt
+            FROM geocode(:address, 1)
+            WHERE rating <= :max_rating
+        ) g
+    """)
 
-def geocode_address(address: str) -> Optional[Tuple[float, float]]:
+    def geocode(self, address: str, db: Optional[Session]) -> Optional[Tuple[float, float]]:
+        if db is None:
+            db = SessionLocal()
+            try:
+                return self._geocode(address, db)
+            finally:
+                db.close()
+        return self._geocode(address, db)
+
+    def _geocode(self, address: str, db: Session) -> Optional[Tuple[float, float]]:
+        zip_match = self._ZIP_PATTERN.match(address)
+        city_match = self._CITY_STATE_PATTERN.match(address)
+        try:
+            if zip_match:
+                row = db.execute(self._ZIP_SQL, {"zip": zip_match.group(1)}).first()
+            elif city_match:
+                row = db.execute(self._PLACE_SQL, {
+                    "city": city_match.group(1).lower(),
+                    "state": city_match.group(2).upper(),
+                }).first()
+            else:
+                row = db.execute(self._ADDRESS_SQL, {
+                    "address": address,
+                    "max_rating": self.TIGER_MAX_RATING,
+                }).first()
+        except SQLAlchemyError:
+            # Leave the session usable for the caller
+            db.rollback()
+            raise
+
+        if row is None or row[0] is None:
+            return None
+        return (row[0], row[1])
+
+
+class NominatimGeocoder(GeocoderBackend):
+    """OpenStreetMap Nominatim over the network, behind `provider_breaker`."""
+    name = "nominatim"
+
+    def geocode(self, address: str, db: Optional[Session]) -> Optional[Tuple[float, float]]:
+        if not provider_breaker.allow():
+            raise GeocodingUnavailableError("Geocoding provider is temporarily unavailable")
+
+        try:
+            location = geolocator.geocode(address)
+        except Exception:
+            provider_breaker.record_failure()
+            raise
+
+        provider_breaker.record_success()
+        if location:
+            return (location.latitude, location.longitude)
+        return None
+
+
+GEOCODER_BACKENDS = {
+    TigerGeocoder.name: TigerGeocoder,
+    NominatimGeocoder.name: NominatimGeocoder,
+}
+
+
+def _build_backends(names: str) -> List[GeocoderBackend]:
+    backends = []
+    for name in (n.strip() for n in names.split(",")):
+        if not name:
+            continue
+        if name not in GEOCODER_BACKENDS:
+            raise ValueError(f"Unknown geocoder backend: {name}")
+        backends.append(GEOCODER_BACKENDS[name]())
+    return backends
+
+
+_backends: List[GeocoderBackend] = _build_backends(settings.GEOCODER_BACKENDS)
+
+
+def _geocode_uncached(address: str, key: str, db: Optional[Session]) -> Optional[Tuple[float, float]]:
+    """Persistent tier, then each backend in order. Populates both cache tiers."""
+    if db is not None:
+        coords = _read_persistent_cache(db, key)
+        if coords is not _NOT_CACHED:
+            if coords is None:
+                _count(_stats, "negative_hits")
+            return coords
+
+    coords = None
+    failed = False
+    unavailable = False
+    for backend in _backends:
+        with _stats_lock:
+            counts = _backend_stats.setdefault(backend.name, Counter())
+        try:
+            _count(counts, "calls")
+            coords = backend.geocode(address, db)
+        except GeocodingUnavailableError:
+            _count(counts, "rejected")
+            unavailable = True
+            continue
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            _count(counts, "errors")
+            failed = True
+            logger.error(f"Geocoding error from {backend.name} for '{address}': {e}")
+            continue
+        except Exception as e:
+            _count(counts, "errors")
+            failed = True
+            logger.error(f"Unexpected geocoding error from {backend.name} for '{address}': {e}")
+            continue
+
+        if coords:
+            _count(counts, "hits")
+            logger.info(f"Geocoded '{address}' via {backend.name} -> {coords}")
+            break
+
+    if coords is None:
+        if unavailable:
+            raise GeocodingUnavailableError("Geocoding provider is temporarily unavailable")
+        if failed:
+            # Some backend couldn't answer, so "not found" isn't trustworthy
+            return None
+        logger.warning(f"Could not geocode address: {address}")
+
+    _memory_cache.set(key, coords, ttl=_cache_ttl(coords).total_seconds())
+    if db is not None:
+        _write_persistent_cache(db, key, coords)
+
+    return coords
+
+
+def _cached_in_memory(key: str):
+    coords = _memory_cache.get(key, _NOT_CACHED)
+    if coords is None:
+        _count(_stats, "negative_hits")
+    return coords
+
+
+def geocode_address(address: str, db: Optional[Session] = None) -> Optional[Tuple[float, float]]:
     """
     Convert an address string to latitude/longitude coordinates.
-    
+
+    Blocks for up to the provider timeout on a cache miss; from async code
+    use `geocode_address_async` instead.
+
     Args:
         address: Address string (can be full address, city, or zipcode)
-    
+        db: Optional database session for the persistent cache tier
+            (the session is committed when a new entry is stored)
+
     Returns:
         Tuple of (latitude, longitude) or None if not found
-    
+
+    Raises:
+        GeocodingUnavailableError: If no backend found the address and the
+            Nominatim circuit is open
+
     Examples:
         - "1600 Amphitheatre Parkway, Mountain View, CA"
         - "San Francisco, CA"
@@ -31,46 +419,76 @@ def geocode_address(address: str) -> Optional[Tuple[float, float]]:
     """
     if not address or len(address.strip()) < 2:
         return None
-    
+
+    key = normalize_address(address)
+
+    coords = _cached_in_memory(key)
+    if coords is not _NOT_CACHED:
+        return coords
+
+    return _geocode_uncached(address, key, db)
+
+
+def _geocode_in_worker(address: str, key: str) -> Optional[Tuple[float, float]]:
+    """Pool entry point; uses its own session since callers may go away."""
+    db = SessionLocal()
     try:
-        location = geolocator.geocode(address)
-        
-        if location:
-            logger.info(f"Geocoded '{address}' -> ({location.latitude}, {location.longitude})")
-            return (location.latitude, location.longitude)
-        else:
-            logger.warning(f"Could not geocode address: {address}")
-            return None
-            
-    except GeocoderTimedOut:
-        logger.error(f"Geocoding timed out for address: {address}")
-        return None
-    except GeocoderServiceError as e:
-        logger.error(f"Geocoding service error for '{address}': {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected geocoding error for '{address}': {e}")
+        return _geocode_uncached(address, key, db)
+    finally:
+        db.close()
+
+
+async def geocode_address_async(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Async version of `geocode_address` that never blocks the event loop.
+
+    Memory-tier hits are answered inline. Everything else runs on the
+    geocoding pool, and concurrent lookups for the same normalized address
+    share a single call.
+
+    Raises:
+        GeocodingUnavailableError: If no backend found the address and the
+            Nominatim circuit is open
+    """
+    if not address or len(address.strip()) < 2:
         return None
 
+    key = normalize_address(address)
+
+    coords = _cached_in_memory(key)
+    if coords is not _NOT_CACHED:
+        return coords
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.get_running_loop().run_in_executor(_executor, _geocode_in_worker, address, key)
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        _count(_stats, "coalesced")
+
+    # Shield so one cancelled request doesn't cancel the lookup for the others
+    return await asyncio.shield(future)
+
 
 def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
     """
     Convert coordinates to an address string.
-    
+
     Args:
         latitude: Latitude coordinate
         longitude: Longitude coordinate
-    
+
     Returns:
         Address string or None if not found
     """
     try:
         location = geolocator.reverse((latitude, longitude))
-        
+
         if location:
             return location.address
         return None
-        
+
     except Exception as e:
         logger.error(f"Reverse geocoding error for ({latitude}, {longitude}): {e}")
         return None
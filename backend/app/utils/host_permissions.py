@@ -2,12 +2,13 @@
 Utility functions for checking host permissions and subscription status.
 """
 from datetime import datetime
-from sqlalchemy.orm import Session
-from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.auth import Principal
 from app.models.host_subscription import HostSubscription, SubscriptionStatus
 
 
-def is_active_host(user: User, db: Session) -> bool:
+async def is_active_host(user: Principal, db: AsyncSession) -> bool:
     """
     Check if a user is an active host with a valid subscription.
     
@@ -27,9 +28,9 @@ def is_active_host(user: User, db: Session) -> bool:
         return False
     
     # Check if user has an active subscription
-    subscription = db.query(HostSubscription).filter(
-        HostSubscription.user_id == user.id
-    ).first()
+    subscription = await db.scalar(
+        select(HostSubscription).where(HostSubscription.user_id == user.id)
+    )
     
     if not subscription:
         return False
@@ -45,11 +46,11 @@ def is_active_host(user: User, db: Session) -> bool:
     return True
 
 
-def can_create_room(user: User, db: Session) -> bool:
+async def can_create_room(user: Principal, db: AsyncSession) -> bool:
     """
     Check if a user can create a new room.
     
     This is an alias for is_active_host for clarity in business logic.
     """
-    return is_active_host(user, db)
+    return await is_active_host(user, db)
 
@@ -0,0 +1,162 @@
+"""
+Cached signing keys for OAuth identity providers (Apple, Google).
+
+Each provider's JWKS document is fetched through one pooled HTTP session and
+kept as parsed key objects indexed by `kid`, for as long as the provider's
+Cache-Control max-age allows. Once an entry is past REFRESH_FRACTION of its
+lifetime, the next lookup triggers a refresh on a background thread and is
+answered from the current keys. A sign-in only waits on the provider when
+the cache is cold, fully expired, or the token names a `kid` we have not
+seen (key rotation). Unknown-kid refetches are rate limited.
+"""
+import logging
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from jose import jwk
+from jose.backends.base import Key
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+
+DEFAULT_MAX_AGE_SECONDS = 3600
+MIN_MAX_AGE_SECONDS = 60
+MAX_MAX_AGE_SECONDS = 24 * 3600
+REFRESH_FRACTION = 0.8
+UNKNOWN_KID_REFETCH_SECONDS = 60
+FETCH_TIMEOUT_SECONDS = 10
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Shared keep-alive session for identity provider requests
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
+
+def _max_age(cache_control: str) -> float:
+    """Seconds a response may be cached for, from its Cache-Control header."""
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return MIN_MAX_AGE_SECONDS
+    match = _MAX_AGE_RE.search(cache_control)
+    max_age = int(match.group(1)) if match else DEFAULT_MAX_AGE_SECONDS
+    return min(max(max_age, MIN_MAX_AGE_SECONDS), MAX_MAX_AGE_SECONDS)
+
+
+class JWKSCache:
+    """Parsed public keys from one JWKS endpoint, indexed by kid."""
+
+    def __init__(self, url: str, algorithm: str = "RS256"):
+        self.url = url
+        self.algorithm = algorithm
+        self._keys: Dict[str, Key] = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        # Serializes foreground fetches so a cold cache costs one request, not one per caller
+        self._fetch_lock = threading.Lock()
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.background_refreshes = 0
+
+    def _fetch(self) -> None:
+        """Download and parse the key set (caller holds no lock)."""
+        try:
+            response = http_session.get(self.url, timeout=FETCH_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            keys = {
+                k["kid"]: jwk.construct(k, self.algorithm)
+                for k in response.json().get("keys", [])
+                if k.get("kid") and k.get("kty") == "RSA"
+            }
+        except Exception:
+            with self._lock:
+                self.fetch_errors += 1
+            raise
+
+        max_age = _max_age(response.headers.get("Cache-Control", ""))
+        now = time.monotonic()
+        with self._lock:
+            self.fetches += 1
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + max_age
+            self._refresh_at = now + max_age * REFRESH_FRACTION
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._fetch()
+        except Exception as e:
+            # Current keys stay in use until they expire
+            logger.warning(f"Background JWKS refresh from {self.url} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def prefetch(self) -> None:
+        """Start a background fetch if one isn't already running (used to warm the cache)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            self.background_refreshes += 1
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def get_key(self, kid: str) -> Optional[Key]:
+        """
+        Public key for kid, or None if the provider doesn't publish it.
+
+        Raises if the provider has to be contacted and can't be reached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            key = self._keys.get(kid)
+            fresh = now < self._expires_at
+            stale = now >= self._refresh_at
+            fetched_at = self._fetched_at
+            can_refetch = now - fetched_at >= UNKNOWN_KID_REFETCH_SECONDS
+
+        if key is not None and fresh:
+            if stale:
+                self.prefetch()
+            return key
+
+        if fresh and not can_refetch:
+            # Unknown kid, and we refetched very recently - don't hammer the provider
+            return None
+
+        with self._fetch_lock:
+            with self._lock:
+                refetched = self._fetched_at > fetched_at
+            if not refetched:
+                self._fetch()
+        with self._lock:
+            return self._keys.get(kid)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "keys": len(self._keys),
+                "fetches": self.fetches,
+                "fetch_errors": self.fetch_errors,
+                "background_refreshes": self.background_refreshes,
+                "expires_in_seconds": max(0, round(self._expires_at - time.monotonic())),
+            }
+
+
+apple_keys = JWKSCache(APPLE_JWKS_URL)
+google_keys = JWKSCache(GOOGLE_JWKS_URL)
+
+
+def get_jwks_stats() -> dict:
+    return {
+        "apple": apple_keys.stats(),
+        "google": google_keys.stats(),
+    }
@@ -0,0 +1,157 @@
+"""
+Queue-backed sink for the private location access audit trail.
+
+Request handlers hand entries to `location_audit_sink.record()`, which never
+waits: it appends to an asyncio queue and returns. A background task started
+from the app lifespan drains the queue in batches (up to
+AUDIT_BATCH_SIZE entries, or whatever arrived within
+AUDIT_FLUSH_INTERVAL_SECONDS) and writes each batch with one multi-row
+INSERT into location_access_audit, creating the month's partition first if
+this worker hasn't seen it yet.
+
+Entries are never silently lost: if the queue is full, the sink isn't
+running (scripts, tests), or a batch insert fails, they are written to the
+`location_audit` logger instead.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.location_access_audit import LocationAccessAudit
+
+logger = logging.getLogger(__name__)
+
+# Fallback destination for entries that couldn't be queued or inserted
+location_audit_logger = logging.getLogger("location_audit")
+location_audit_logger.setLevel(logging.INFO)
+
+# Queued by stop() so the drain task finishes its current batch and exits
+_STOP = object()
+
+
+def _month_bounds(moment: datetime) -> Tuple[datetime, datetime]:
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
+
+def _log_entry(entry: dict) -> None:
+    if entry["access_granted"]:
+        location_audit_logger.info(f"PRIVATE_LOCATION_ACCESS: {entry}")
+    else:
+        location_audit_logger.warning(f"PRIVATE_LOCATION_DENIED: {entry}")
+
+
+class LocationAuditSink:
+    """Batches audit entries from the event loop into bulk inserts."""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._partitions: Set[datetime] = set()
+        self.written = 0
+        self.batches = 0
+        self.fallback_logged = 0
+
+    def record(self, user_id: int, room_id: int, access_granted: bool, reason: Optional[str] = None) -> None:
+        """Queue one audit entry without blocking."""
+        entry = {
+            "accessed_at": datetime.utcnow(),
+            "user_id": user_id,
+            "room_id": room_id,
+            "access_granted": access_granted,
+            "reason": reason,
+        }
+        if self._queue is None:
+            self._fallback([entry])
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self._fallback([entry])
+
+    def _fallback(self, entries: List[dict]) -> None:
+        self.fallback_logged += len(entries)
+        for entry in entries:
+            _log_entry(entry)
+
+    async def _ensure_partitions(self, db, entries: List[dict]) -> None:
+        for start in {_month_bounds(e["accessed_at"])[0] for e in entries} - self._partitions:
+            start, end = _month_bounds(start)
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS location_access_audit_{start:%Y_%m} "
+                f"PARTITION OF location_access_audit "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            ))
+            await db.commit()
+            self._partitions.add(start)
+
+    async def _write(self, entries: List[dict]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await self._ensure_partitions(db, entries)
+                await db.execute(insert(LocationAccessAudit), entries)
+                await db.commit()
+            self.written += len(entries)
+            self.batches += 1
+        except SQLAlchemyError as e:
+            logger.error(f"Could not write {len(entries)} location audit entries: {e}")
+            self._fallback(entries)
+        except Exception as e:
+            logger.error(f"Unexpected error writing {len(entries)} location audit entries: {e}")
+            self._fallback(entries)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = []
+            entry = await queue.get()
+            deadline = loop.time() + settings.AUDIT_FLUSH_INTERVAL_SECONDS
+            while True:
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                timeout = deadline - loop.time()
+                if len(batch) >= settings.AUDIT_BATCH_SIZE or timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._write(batch)
+
+    def start(self) -> None:
+        """Start draining the queue (call from the app lifespan)."""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=settings.AUDIT_QUEUE_MAXSIZE)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything queued so far, then stop the drain task."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "batches": self.batches,
+            "fallback_logged": self.fallback_logged,
+        }
+
+
+location_audit_sink = LocationAuditSink()
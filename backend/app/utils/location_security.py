@@ -2,60 +2,152 @@
 Location security utilities to prevent location leakage.
 
 Security measures implemented:
-1. Distance fuzzing - adds random noise to distances to prevent triangulation
-2. Access logging - logs access to private location data
+1. Distance fuzzing - adds keyed, deterministic noise to distances to prevent
+   triangulation and averaging
+2. Access logging - records access to private location data in location_access_audit
 3. Membership verification helpers
 """
-import random
-import logging
-from datetime import datetime
-from typing import Optional
-from sqlalchemy.orm import Session
+import hashlib
+import hmac
+import math
+import time
+from typing import List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
 
 from app.models.room_member import RoomMember, RoomMemberStatus
 from app.models.room import Room
-
-# Configure logger for location access auditing
-location_audit_logger = logging.getLogger("location_audit")
-location_audit_logger.setLevel(logging.INFO)
+from app.utils.location_audit import location_audit_sink
 
 # Distance fuzzing parameters
-# Add ±5-15% random noise to distances to prevent triangulation attacks
+# Add ±5-15% noise to distances to prevent triangulation attacks
 DISTANCE_FUZZ_MIN_PERCENT = 0.05  # 5% minimum noise
 DISTANCE_FUZZ_MAX_PERCENT = 0.15  # 15% maximum noise
 
+# Noise for a given (room, origin cell) stays fixed for this long
+DISTANCE_FUZZ_EPOCH_SECONDS = 3600
+
+# Origin cells for fuzzing (~5.5km north-south): every query origin inside a
+# cell shares one noise factor per room, different cells get independent ones.
+# Much coarser than the discovery cache grid, so nudging the origin gains nothing.
+DISTANCE_FUZZ_CELL_DEGREES = 0.05
+
+# Dedicated key so fuzz values can't be related to other SECRET_KEY uses
+_fuzz_key = hashlib.sha256(f"distance-fuzz:{settings.SECRET_KEY}".encode()).digest()
+
+
+def current_fuzz_epoch() -> int:
+    """Index of the current fuzzing epoch."""
+    return int(time.time() // DISTANCE_FUZZ_EPOCH_SECONDS)
+
+
+def seconds_until_next_fuzz_epoch() -> int:
+    """Seconds until fuzzed distances change."""
+    return int(DISTANCE_FUZZ_EPOCH_SECONDS - time.time() % DISTANCE_FUZZ_EPOCH_SECONDS)
+
+
+def fuzz_origin_cell(latitude: Optional[float], longitude: Optional[float]) -> str:
+    """Coarse cell of a query origin, used to key distance noise ("" when there is no origin)."""
+    if latitude is None or longitude is None:
+        return ""
+    return f"{math.floor(latitude / DISTANCE_FUZZ_CELL_DEGREES)}:{math.floor(longitude / DISTANCE_FUZZ_CELL_DEGREES)}"
+
+
+def _noise_percent(mac, room_id: int, origin_cell: str, epoch: int) -> float:
+    """Signed noise in ±[min, max] percent derived from HMAC(room, origin cell, epoch)."""
+    mac = mac.copy()
+    mac.update(f"{room_id}:{origin_cell}:{epoch}".encode())
+    digest = mac.digest()
+
+    fraction = int.from_bytes(digest[:8], "big") / 2**64
+    noise_percent = DISTANCE_FUZZ_MIN_PERCENT + fraction * (DISTANCE_FUZZ_MAX_PERCENT - DISTANCE_FUZZ_MIN_PERCENT)
+    return -noise_percent if digest[8] & 1 else noise_percent
+
+
+def _apply_noise(distance_meters: float, noise_percent: float) -> float:
+    # Ensure distance is never negative
+    return max(0, round(distance_meters * (1 + noise_percent), 2))
 
-def fuzz_distance(distance_meters: float) -> float:
+
+def fuzz_distance(
+    distance_meters: float,
+    room_id: int,
+    origin_cell: str,
+    epoch: Optional[int] = None
+) -> float:
     """
-    Add random noise to distance to prevent triangulation attacks.
+    Add noise to distance to prevent triangulation attacks.
     
     Without fuzzing, an attacker could:
     1. Query from multiple known positions
     2. Get exact distances to each position
     3. Use triangulation to pinpoint exact location
     
-    By adding ±5-15% random noise, triangulation becomes unreliable.
+    The distance is scaled by a ±5-15% factor derived from a keyed hash of
+    (room, origin cell, epoch). What that guarantees:
+    - Within one epoch, every origin in the same ~5km cell gets the same
+      value for a room, so repeating or nudging a query yields nothing new.
+    - Origins in different cells get independent factors, so the ratios
+      between distances from different cells are off by up to ~30%, and
+      trilateration with an unknown common scale factor doesn't apply.
+    - Distances are measured to public_location, which is itself offset
+      200-500m from the room, so even a noise-free fix only finds that point.
+    
+    It does not stop an attacker who queries from many separate cells (or
+    across many epochs) from averaging independent errors down towards
+    public_location; rate limits on location queries bound that.
     
     Args:
         distance_meters: The actual distance in meters
+        room_id: Room the distance points to
+        origin_cell: Cell of the query origin, from fuzz_origin_cell
+        epoch: Fuzzing epoch, defaults to the current one
     
     Returns:
-        Fuzzed distance with random noise applied
+        Fuzzed distance with noise applied
     """
     if distance_meters is None or distance_meters <= 0:
         return distance_meters
     
-    # Random noise percentage between ±5% and ±15%
-    noise_percent = random.uniform(DISTANCE_FUZZ_MIN_PERCENT, DISTANCE_FUZZ_MAX_PERCENT)
+    if epoch is None:
+        epoch = current_fuzz_epoch()
     
-    # Randomly add or subtract
-    if random.choice([True, False]):
-        noise_percent = -noise_percent
+    mac = hmac.new(_fuzz_key, digestmod=hashlib.sha256)
+    return _apply_noise(distance_meters, _noise_percent(mac, room_id, origin_cell, epoch))
+
+
+def fuzz_distances(
+    distances_meters: Sequence[Optional[float]],
+    room_ids: Sequence[int],
+    origin_cell: str,
+    epoch: Optional[int] = None
+) -> List[Optional[float]]:
+    """
+    Fuzz a whole result page at once.
     
-    fuzzed_distance = distance_meters * (1 + noise_percent)
+    Same values as calling `fuzz_distance` per row, but the epoch and the
+    keyed HMAC state are set up once for the page.
     
-    # Ensure distance is never negative
-    return max(0, round(fuzzed_distance, 2))
+    Args:
+        distances_meters: Actual distances (None entries are passed through)
+        room_ids: Room id for each distance
+        origin_cell: Cell of the query origin, from fuzz_origin_cell
+        epoch: Fuzzing epoch, defaults to the current one
+    
+    Returns:
+        Fuzzed distances, in input order
+    """
+    if epoch is None:
+        epoch = current_fuzz_epoch()
+    
+    mac = hmac.new(_fuzz_key, digestmod=hashlib.sha256)
+    return [
+        distance if distance is None or distance <= 0
+        else _apply_noise(distance, _noise_percent(mac, room_id, origin_cell, epoch))
+        for distance, room_id in zip(distances_meters, room_ids)
+    ]
 
 
 def log_private_location_access(
@@ -67,7 +159,9 @@ def log_private_location_access(
     """
     Log access attempts to private location data for security auditing.
     
-    This creates an audit trail of who accessed private location data and when.
+    This creates an audit trail of who accessed private location data and when,
+    queryable in the location_access_audit table. The entry is queued and
+    written in a batch in the background, so this never blocks the request.
     Useful for:
     - Detecting suspicious access patterns
     - Compliance and privacy audits
@@ -79,22 +173,11 @@ def log_private_location_access(
         access_granted: Whether access was granted
         reason: Optional reason for denial or additional context
     """
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "user_id": user_id,
-        "room_id": room_id,
-        "access_granted": access_granted,
-        "reason": reason
-    }
-    
-    if access_granted:
-        location_audit_logger.info(f"PRIVATE_LOCATION_ACCESS: {log_entry}")
-    else:
-        location_audit_logger.warning(f"PRIVATE_LOCATION_DENIED: {log_entry}")
-
-
-def verify_room_membership(
-    db: Session,
+    location_audit_sink.record(user_id, room_id, access_granted, reason)
+
+
+async def verify_room_membership(
+    db: AsyncSession,
     user_id: int,
     room_id: int
 ) -> tuple[bool, str]:
@@ -112,7 +195,7 @@ def verify_room_membership(
         Tuple of (is_authorized, reason)
     """
     # Check if room exists
-    room = db.query(Room).filter(Room.id == room_id).first()
+    room = await db.scalar(select(Room).where(Room.id == room_id))
     if not room:
         return False, "room_not_found"
     
@@ -125,20 +208,20 @@ def verify_room_membership(
         return True, "user_is_host"
     
     # Check if user is an active member
-    member = db.query(RoomMember).filter(
+    member = await db.scalar(select(RoomMember).where(
         RoomMember.user_id == user_id,
         RoomMember.room_id == room_id,
         RoomMember.status == RoomMemberStatus.ACTIVE
-    ).first()
+    ))
     
     if member:
         return True, "user_is_active_member"
     
     # Check if user was previously a member (for audit purposes)
-    past_member = db.query(RoomMember).filter(
+    past_member = await db.scalar(select(RoomMember).where(
         RoomMember.user_id == user_id,
         RoomMember.room_id == room_id
-    ).first()
+    ))
     
     if past_member:
         return False, f"membership_status_{past_member.status.value}"
@@ -0,0 +1,69 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor holds the sort key of the last row of a page, so the next page can
+start with `WHERE (key, id) > (:key, :id)` instead of OFFSET. Cursors are
+encrypted rather than just encoded: a geo cursor contains the exact sort
+distance, which must not leak around the distance fuzzing applied to
+responses (see location_security.py).
+
+The next cursor is returned in the `X-Next-Cursor` response header so list
+endpoints keep returning plain JSON arrays.
+"""
+import base64
+import hashlib
+import json
+from typing import Any, List
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Derive a dedicated Fernet key so cursors can't be confused with other
+# tokens signed with SECRET_KEY
+_cursor_fernet = Fernet(
+    base64.urlsafe_b64encode(hashlib.sha256(f"cursor:{settings.SECRET_KEY}".encode()).digest())
+)
+
+
+def encode_cursor(kind: str, key: List[Any]) -> str:
+    """
+    Build an opaque cursor.
+
+    Args:
+        kind: Ordering the cursor belongs to (e.g. "geo", "time")
+        key: JSON-serializable sort key of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"k": kind, "v": key}, separators=(",", ":")).encode()
+    return _cursor_fernet.encrypt(payload).decode()
+
+
+def decode_cursor(cursor: str, kind: str) -> List[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: Cursor string from the client
+        kind: Ordering the caller expects
+
+    Returns:
+        The sort key stored in the cursor
+
+    Raises:
+        ValueError: If the cursor is malformed, tampered with, or was issued
+            for a different ordering
+    """
+    try:
+        payload = json.loads(_cursor_fernet.decrypt(cursor.encode()))
+    except (InvalidToken, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(payload, dict) or payload.get("k") != kind or not isinstance(payload.get("v"), list):
+        raise ValueError("Invalid cursor")
+
+    return payload["v"]
@@ -0,0 +1,108 @@
+"""
+Denormalized seat counters on rooms.
+
+rooms.active_member_count and rooms.waitlist_count mirror the number of
+ACTIVE and WAITLISTED rows in room_members, and rooms.has_open_seats is a
+generated column derived from them. Discovery reads these columns instead of
+aggregating room_members on every request.
+
+Every path that changes a membership status must await
+`record_member_transition` in the same transaction as the status change.
+If the counters ever drift (manual SQL, old data), rebuild them with:
+
+    python -m app.utils.room_counters
+"""
+from typing import Optional
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.room import Room
+from app.models.room_member import RoomMemberStatus
+
+
+async def record_member_transition(
+    db: AsyncSession,
+    room_id: int,
+    old_status: Optional[RoomMemberStatus],
+    new_status: Optional[RoomMemberStatus]
+) -> None:
+    """
+    Adjust a room's seat counters for one membership status change.
+    
+    Uses relative UPDATEs (count = count + delta) so concurrent transactions
+    never overwrite each other's adjustments.
+    
+    Args:
+        db: Database session (the caller commits)
+        room_id: Room whose membership changed
+        old_status: Previous member status, or None for a new member row
+        new_status: New member status
+    """
+    active_delta = int(new_status == RoomMemberStatus.ACTIVE) - int(old_status == RoomMemberStatus.ACTIVE)
+    waitlist_delta = int(new_status == RoomMemberStatus.WAITLISTED) - int(old_status == RoomMemberStatus.WAITLISTED)
+    await adjust_room_counters(db, room_id, active_delta, waitlist_delta)
+
+
+async def adjust_room_counters(db: AsyncSession, room_id: int, active_delta: int, waitlist_delta: int) -> None:
+    """
+    Apply net counter changes for any number of membership transitions at once.
+    
+    Bulk paths sum their deltas and call this once instead of
+    record_member_transition per member.
+    """
+    if not active_delta and not waitlist_delta:
+        return
+    
+    await db.execute(
+        update(Room)
+        .where(Room.id == room_id)
+        .values(
+            active_member_count=Room.active_member_count + active_delta,
+            waitlist_count=Room.waitlist_count + waitlist_delta,
+        )
+    )
+
+
+def reconcile_room_counters(db: Session) -> int:
+    """
+    Rebuild the seat counters of every room from room_members.
+    
+    Runs as a single set-wise UPDATE and only touches rooms whose counters
+    are wrong.
+    
+    Args:
+        db: Database session (the caller commits)
+    
+    Returns:
+        Number of rooms that were corrected
+    """
+    result = db.execute(text("""
+        UPDATE rooms
+        SET active_member_count = counts.active,
+            waitlist_count = counts.waitlisted
+        FROM (
+            SELECT r.id AS room_id,
+                   count(m.id) FILTER (WHERE m.status = 'active') AS active,
+                   count(m.id) FILTER (WHERE m.status = 'waitlisted') AS waitlisted
+            FROM rooms r
+            LEFT JOIN room_members m ON m.room_id = r.id
+            GROUP BY r.id
+        ) AS counts
+        WHERE rooms.id = counts.room_id
+          AND (rooms.active_member_count <> counts.active
+               OR rooms.waitlist_count <> counts.waitlisted)
+    """))
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        corrected = reconcile_room_counters(db)
+        db.commit()
+        print(f"Reconciled seat counters: {corrected} room(s) corrected")
+    finally:
+        db.close()
@@ -1,15 +1,31 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException
-import google.auth.transport.requests
-from google.oauth2 import id_token
-import requests
 
 from app.core.config import settings
+from app.utils.jwks import apple_keys, google_keys
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds to the configured cost makes needs_update() flag any
+# hash made with a different cost, so logins rehash it transparently
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt is deliberately slow CPU work; it runs on its own small pool so it
+# never blocks the event loop, and callers beyond PASSWORD_HASH_MAX_PENDING
+# are turned away instead of queueing behind a login storm
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_lock = threading.Lock()
+_hash_stats = {"pending": 0, "completed": 0, "rejected": 0, "rehashed": 0}
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +38,53 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_hashing(func, *args):
+    with _hash_lock:
+        if _hash_stats["pending"] >= settings.PASSWORD_HASH_MAX_PENDING:
+            _hash_stats["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many sign-in attempts in progress, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _hash_stats["pending"] += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        with _hash_lock:
+            _hash_stats["pending"] -= 1
+            _hash_stats["completed"] += 1
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt pool"""
+    return await _run_hashing(pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the bcrypt pool.
+    
+    Returns (valid, new_hash). new_hash is set when the stored hash was made
+    with a different cost than BCRYPT_ROUNDS; the caller should store it.
+    """
+    valid, new_hash = await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+    if new_hash:
+        with _hash_lock:
+            _hash_stats["rehashed"] += 1
+    return valid, new_hash
+
+
+def get_password_hash_stats() -> dict:
+    with _hash_lock:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+            "rounds": settings.BCRYPT_ROUNDS,
+            **_hash_stats,
+        }
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -34,6 +97,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def decode_access_token_subject(token: str) -> Optional[str]:
+    """Return the `sub` claim of a valid access token, or None"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
 def verify_google_token(token: str) -> Dict[str, Any]:
     """Verify Google ID token and return user info"""
     if not settings.GOOGLE_CLIENT_ID:
@@ -43,11 +115,22 @@ def verify_google_token(token: str) -> Dict[str, Any]:
         )
     
     try:
-        request = google.auth.transport.requests.Request()
-        idinfo = id_token.verify_oauth2_token(token, request, settings.GOOGLE_CLIENT_ID)
+        kid = jwt.get_unverified_header(token).get('kid')
+        if not kid:
+            raise ValueError('Token missing key ID')
+        
+        public_key = google_keys.get_key(kid)
+        if public_key is None:
+            raise ValueError('Google key not found')
         
-        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-            raise ValueError('Wrong issuer.')
+        idinfo = jwt.decode(
+            token,
+            public_key,
+            algorithms=['RS256'],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=['accounts.google.com', 'https://accounts.google.com'],
+            options={'verify_at_hash': False}
+        )
         
         return {
             'email': idinfo.get('email'),
@@ -55,7 +138,7 @@ def verify_google_token(token: str) -> Dict[str, Any]:
             'full_name': idinfo.get('name'),
             'email_verified': idinfo.get('email_verified', False)
         }
-    except ValueError as e:
+    except (JWTError, ValueError) as e:
         raise HTTPException(status_code=401, detail=f"Invalid Google token: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Failed to verify Google token: {str(e)}")
@@ -70,10 +153,6 @@ def verify_apple_token(token: str) -> Dict[str, Any]:
         )
     
     try:
-        from cryptography.hazmat.primitives.asymmetric import rsa
-        from cryptography.hazmat.backends import default_backend
-        import base64
-        
         # Decode the token header to get the key ID
         unverified_header = jwt.get_unverified_header(token)
         kid = unverified_header.get('kid')
@@ -81,34 +160,11 @@ def verify_apple_token(token: str) -> Dict[str, Any]:
         if not kid:
             raise ValueError('Token missing key ID')
         
-        # Get Apple's public keys
-        apple_keys_url = 'https://appleid.apple.com/auth/keys'
-        response = requests.get(apple_keys_url, timeout=10)
-        response.raise_for_status()
-        keys = response.json().get('keys', [])
-        
-        # Find the key with matching kid
-        key_data = None
-        for k in keys:
-            if k.get('kid') == kid:
-                key_data = k
-                break
-        
-        if not key_data:
+        # Get Apple's public key for this kid (cached, see app.utils.jwks)
+        public_key = apple_keys.get_key(kid)
+        if public_key is None:
             raise ValueError('Apple key not found')
         
-        # Convert JWK to RSA public key
-        # Handle base64 padding
-        n_str = key_data['n']
-        e_str = key_data['e']
-        n = base64.urlsafe_b64decode(n_str + '==' if len(n_str) % 4 == 2 else n_str + '=' if len(n_str) % 4 == 3 else n_str)
-        e = base64.urlsafe_b64decode(e_str + '==' if len(e_str) % 4 == 2 else e_str + '=' if len(e_str) % 4 == 3 else e_str)
-        
-        n_int = int.from_bytes(n, 'big')
-        e_int = int.from_bytes(e, 'big')
-        
-        public_key = rsa.RSAPublicNumbers(e_int, n_int).public_key(default_backend())
-        
         # Decode the token
         decoded = jwt.decode(
             token,
@@ -0,0 +1,69 @@
+"""
+Room seat allocation: the room lock and automatic waitlist promotion.
+
+Every path that seats, waitlists or frees a seat in a room takes the room
+row lock first (`lock_room`), so capacity checks and promotions for one room
+never interleave. Rooms with `auto_promote_waitlist` enabled fill freed
+seats from the head of the waitlist in the same transaction that freed
+them, via `promote_waitlist_heads`.
+"""
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.room import Room
+from app.utils.events import notify_memberships, notify_waitlist_positions
+from app.utils.room_counters import adjust_room_counters
+
+
+async def lock_room(db: AsyncSession, room_id: int) -> Room:
+    """
+    Load a room with a row lock held until commit.
+    
+    Concurrent approvals, promotions and departures for the same room are
+    serialized on this lock, so the capacity checks they make stay true
+    until they commit.
+    """
+    return await db.scalar(
+        select(Room).where(Room.id == room_id).with_for_update().execution_options(populate_existing=True)
+    )
+
+
+async def promote_waitlist_heads(db: AsyncSession, room_id: int) -> int:
+    """
+    Move waitlist heads into the room's open seats, if it opted in.
+    
+    One UPDATE promotes as many members, in queue order, as there are open
+    seats according to the room's seat counters (which must already reflect
+    any change made earlier in the transaction), and notifies the promoted
+    members and the rest of the line. Does nothing for rooms without
+    auto_promote_waitlist, inactive rooms, or full rooms. The caller must
+    hold the room lock and commits.
+    
+    Returns:
+        Number of members promoted
+    """
+    result = await db.execute(text("""
+        UPDATE room_members m
+        SET status = 'active',
+            queue_key = NULL,
+            joined_at = now() AT TIME ZONE 'utc',
+            updated_at = now() AT TIME ZONE 'utc'
+        FROM rooms r,
+             (SELECT id, row_number() OVER (ORDER BY queue_key) AS position
+              FROM room_members
+              WHERE room_id = :room_id AND status = 'waitlisted') AS waitlist
+        WHERE r.id = :room_id
+          AND r.auto_promote_waitlist
+          AND r.is_active
+          AND m.id = waitlist.id
+          AND (r.max_players IS NULL OR waitlist.position <= r.max_players - r.active_member_count)
+        RETURNING m.user_id
+    """), {"room_id": room_id})
+    
+    promoted_user_ids = result.scalars().all()
+    if promoted_user_ids:
+        promoted = len(promoted_user_ids)
+        await adjust_room_counters(db, room_id, promoted, -promoted)
+        await notify_memberships(db, room_id, promoted_user_ids)
+        await notify_waitlist_positions(db, room_id)
+    return len(promoted_user_ids)
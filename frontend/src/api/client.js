@@ -81,7 +81,7 @@ const createApiClient = () => {
         throw error;
       }
 
-      return { data: parsedData, status: response.status };
+      return { data: parsedData, status: response.status, headers: response.headers };
     } catch (error) {
       clearTimeout(timeoutId);
       if (error.name === 'AbortError') {
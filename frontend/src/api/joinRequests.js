@@ -33,12 +33,33 @@ export const joinRequestsApi = {
     return response.data;
   },
 
+  // Approve and/or reject many pending requests for one room in one call (host only)
+  bulkDecide: async (roomId, approve = [], reject = []) => {
+    const response = await apiClient.post('/join-requests/bulk-decide', {
+      room_id: roomId,
+      approve,
+      reject,
+    });
+    return response.data;
+  },
+
   // Cancel join request
   cancel: async (requestId) => {
     const response = await apiClient.delete(`/join-requests/${requestId}`);
     return response.data;
   },
 
+  // Host inbox: one page of pending requests with requester profiles;
+  // pass the returned nextCursor back to fetch the next page
+  inboxPage: async (roomId, cursor = null) => {
+    const params = cursor ? { cursor } : {};
+    const response = await apiClient.get(`/join-requests/rooms/${roomId}/inbox`, { params });
+    return {
+      requests: response.data,
+      nextCursor: response.headers.get('x-next-cursor'),
+    };
+  },
+
   // ========== WAITLIST ENDPOINTS ==========
 
   // Get room waitlist (host only)
@@ -1,4 +1,5 @@
 import apiClient from './client';
+import { API_BASE_URL } from './config';
 
 export const roomsApi = {
   // List rooms with optional filters (geospatial search)
@@ -7,6 +8,33 @@ export const roomsApi = {
     return response.data;
   },
 
+  // List one page of rooms; pass the returned nextCursor back as params.cursor
+  listPage: async (params = {}) => {
+    const response = await apiClient.get('/rooms/', { params });
+    return {
+      rooms: response.data,
+      nextCursor: response.headers.get('x-next-cursor'),
+    };
+  },
+
+  // List rooms inside a map viewport ({ min_lat, min_lon, max_lat, max_lon } plus filters)
+  listInViewport: async (params = {}) => {
+    const response = await apiClient.get('/rooms/viewport', { params });
+    return {
+      rooms: response.data,
+      truncated: response.headers.get('x-viewport-truncated') === 'true',
+    };
+  },
+
+  // Get clustered pins for a zoomed-out viewport ({ min_lat, min_lon, max_lat, max_lon, zoom } plus filters)
+  listClusters: async (params = {}) => {
+    const response = await apiClient.get('/rooms/clusters', { params });
+    return response.data;
+  },
+
+  // URL template for the room pin vector tiles (for map tile overlays)
+  tileUrlTemplate: () => `${API_BASE_URL}/rooms/tiles/{z}/{x}/{y}.mvt`,
+
   // Get rooms the user is hosting or is an active member of
   getMyRooms: async () => {
     const response = await apiClient.get('/rooms/my-rooms');
@@ -51,9 +79,11 @@ export const roomsApi = {
     return response.data;
   },
 
-  // Get room members (active and waitlisted)
-  getMembers: async (roomId) => {
-    const response = await apiClient.get(`/rooms/${roomId}/members`);
+  // Get room members (active and waitlisted) with profile and reputation
+  getMembers: async (roomId, skip = 0, limit = 100) => {
+    const response = await apiClient.get(`/rooms/${roomId}/members`, {
+      params: { skip, limit },
+    });
     return response.data;
   },
 
@@ -1,5 +1,5 @@
 import React, { useState } from 'react';
-import { View, Text, StyleSheet, ScrollView, Alert, TouchableOpacity, Platform } from 'react-native';
+import { View, Text, StyleSheet, ScrollView, Alert, TouchableOpacity, Platform, Switch } from 'react-native';
 import DateTimePicker from '@react-native-community/datetimepicker';
 import * as Location from 'expo-location';
 import { Button, Input, OptionSheet } from '../components';
@@ -35,6 +35,7 @@ export const CreateRoomScreen = ({ navigation }) => {
   const [latitude, setLatitude] = useState('');
   const [longitude, setLongitude] = useState('');
   const [maxPlayers, setMaxPlayers] = useState('');
+  const [autoPromoteWaitlist, setAutoPromoteWaitlist] = useState(false);
   const [buyInInfo, setBuyInInfo] = useState('');
   const [buyInMin, setBuyInMin] = useState('');
   const [buyInMax, setBuyInMax] = useState('');
@@ -174,6 +175,7 @@ export const CreateRoomScreen = ({ navigation }) => {
         latitude: lat,
         longitude: lon,
         max_players: maxPlayers ? parseInt(maxPlayers, 10) : null,
+        auto_promote_waitlist: autoPromoteWaitlist,
         buy_in_info: buyInInfo || null,
         buy_in_min: buyInMin ? parseInt(buyInMin, 10) : null,
         buy_in_max: buyInMax ? parseInt(buyInMax, 10) : null,
@@ -400,6 +402,16 @@ export const CreateRoomScreen = ({ navigation }) => {
         keyboardType="number-pad"
       />
 
+      <View style={styles.switchRow}>
+        <View style={styles.switchText}>
+          <Text style={styles.sectionTitle}>Auto-fill from waitlist</Text>
+          <Text style={styles.sectionHint}>
+            When a seat opens, the next player on the waitlist takes it automatically
+          </Text>
+        </View>
+        <Switch value={autoPromoteWaitlist} onValueChange={setAutoPromoteWaitlist} />
+      </View>
+
       <View style={styles.locationSection}>
         <Text style={styles.sectionTitle}>Buy-in (informational only)</Text>
         <Text style={styles.sectionHint}>
@@ -574,6 +586,14 @@ const styles = StyleSheet.create({
     color: '#1a1a2e',
     fontWeight: '600',
   },
+  switchRow: {
+    flexDirection: 'row',
+    alignItems: 'center',
+    gap: 12,
+  },
+  switchText: {
+    flex: 1,
+  },
   buyInRow: {
     flexDirection: 'row',
     gap: 12,
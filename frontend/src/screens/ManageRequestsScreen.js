@@ -10,11 +10,14 @@ export const ManageRequestsScreen = ({ route }) => {
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
   const [actionLoading, setActionLoading] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const loadRequests = async () => {
     try {
-      const data = await joinRequestsApi.list(roomId);
-      setRequests(data);
+      const page = await joinRequestsApi.inboxPage(roomId);
+      setRequests(page.requests);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       Alert.alert('Error', 'Failed to load requests');
     } finally {
@@ -23,6 +26,20 @@ export const ManageRequestsScreen = ({ route }) => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await joinRequestsApi.inboxPage(roomId, nextCursor);
+      setRequests((prev) => [...prev, ...page.requests]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      Alert.alert('Error', 'Failed to load more requests');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useFocusEffect(
     useCallback(() => {
       loadRequests();
@@ -45,9 +62,16 @@ export const ManageRequestsScreen = ({ route }) => {
   const renderRequest = ({ item }) => (
     <Card>
       <View style={styles.header}>
-        <CardTitle>User #{item.user_id}</CardTitle>
+        <CardTitle>{item.username}</CardTitle>
         <Badge text={item.status} variant={item.status} />
       </View>
+      <Text style={styles.reputation}>
+        {item.review_count > 0
+          ? `★ ${item.avg_rating.toFixed(1)} (${item.review_count} reviews)`
+          : 'No reviews yet'}
+        {` · ${item.games_completed} games`}
+        {item.skill_level ? ` · ${item.skill_level}` : ''}
+      </Text>
       {item.message && <CardSubtitle>{item.message}</CardSubtitle>}
       <Text style={styles.date}>
         Requested: {new Date(item.created_at).toLocaleDateString()}
@@ -81,6 +105,8 @@ export const ManageRequestsScreen = ({ route }) => {
         renderItem={renderRequest}
         keyExtractor={(item) => item.id.toString()}
         contentContainerStyle={styles.list}
+        onEndReached={loadMore}
+        onEndReachedThreshold={0.3}
         refreshControl={
           <RefreshControl refreshing={refreshing} onRefresh={() => {
             setRefreshing(true);
@@ -90,7 +116,7 @@ export const ManageRequestsScreen = ({ route }) => {
         ListEmptyComponent={
           !loading && (
             <View style={styles.empty}>
-              <Text style={styles.emptyText}>No join requests</Text>
+              <Text style={styles.emptyText}>No pending join requests</Text>
             </View>
           )
         }
@@ -112,6 +138,11 @@ const styles = StyleSheet.create({
     justifyContent: 'space-between',
     alignItems: 'center',
   },
+  reputation: {
+    fontSize: 13,
+    color: '#666',
+    marginTop: 4,
+  },
   date: {
     fontSize: 12,
     color: '#999',